@@ -4,19 +4,20 @@ USE video_game_market;
 DROP TABLE IF EXISTS games;
 CREATE TABLE games (
     game_id INT AUTO_INCREMENT PRIMARY KEY,
-    rawg_id INT NOT NULL,
+    rawg_id INT NOT NULL UNIQUE,
     game_name VARCHAR(255),
     release_date DATE,
     user_rating FLOAT,
     ratings_count INT,
-    avg_playtime_hours FLOAT
+    avg_playtime_hours FLOAT,
+    last_updated DATETIME
 );
 
 
 DROP TABLE IF EXISTS platforms;
 CREATE TABLE platforms (
     platform_id INT AUTO_INCREMENT PRIMARY KEY,
-    platform_name VARCHAR(100) NOT NULL
+    platform_name VARCHAR(100) NOT NULL UNIQUE
 );
 
 DROP TABLE IF EXISTS genres;
@@ -28,7 +29,7 @@ CREATE TABLE genres (
 DROP TABLE IF EXISTS stores;
 CREATE TABLE stores (
     store_id INT AUTO_INCREMENT PRIMARY KEY,
-    store_name VARCHAR(100) NOT NULL
+    store_name VARCHAR(100) NOT NULL UNIQUE
 );
 
 DROP TABLE IF EXISTS game_platforms;
@@ -57,3 +58,9 @@ CREATE TABLE game_stores (
     FOREIGN KEY (game_id) REFERENCES games(game_id),
     FOREIGN KEY (store_id) REFERENCES stores(store_id)
 );
+
+DROP TABLE IF EXISTS sync_state;
+CREATE TABLE sync_state (
+    source VARCHAR(50) PRIMARY KEY,
+    high_watermark VARCHAR(19)
+);
@@ -1,42 +1,43 @@
 import pandas as pd
 import re
 
+import taxonomy_functions as tf
+
+
 # ====================================================================================================================
-# 1. Additional function to create a platform flag dataframe (useful for ML models analysis and Hypothesis Testing)
+# Keyword taxonomies (compiled once into token automatons, see taxonomy_functions)
 # ====================================================================================================================
 
-def create_platform_flags(df):
-    # ----------------------------------
-    # New dataframe with id + game name
-    # ----------------------------------
-    out = pd.DataFrame()
-    out["rawg_id"] = df["rawg_id"]
-    out["game_name"] = df["game_name"]
+PLATFORM_TAXONOMY = {
+    "pc": ["PC"],
+    "playstation": ["PlayStation"],
+    "xbox": ["Xbox"],
+    "nintendo": ["Switch", "Wii", "GameCube", "Nintendo", "3DS"],
+    "mobile": ["iOS", "Android"],
+}
 
-    # ----------------------------------
-    # Source : platforms_list column
-    # ----------------------------------
-    pls = df["platforms_list"].astype(str)
+# Matching is whole-token, so compound abbreviations (MMORPG, PvPvE...) are listed explicitly
+MULTIPLAYER_TAXONOMY = {
+    "multiplayer": [
+        "multiplayer", "multi-player", "online", "co-op", "co op", "coop", "cooperative", "co-operative",
+        "fps", "mmo", "mmorpg", "mmofps", "mmorts", "mmog", "pvp", "pve", "pvpve",
+        "crossplay", "cross-play", "lan", "battle-royale", "battle royale", "survival-multiplayer"
+    ],
+}
+
+PLATFORM_AUTOMATON = tf.build_keyword_automaton(PLATFORM_TAXONOMY)
+MULTIPLAYER_AUTOMATON = tf.build_keyword_automaton(MULTIPLAYER_TAXONOMY)
 
-    # ----------------------------------
-    # Flags
-    # ----------------------------------
-    out["is_pc"] = pls.str.contains(r"\bPC\b", case=False, regex=True)
-    out["is_playstation"] = pls.str.contains(r"PlayStation", case=False, regex=True)
-    out["is_xbox"] = pls.str.contains(r"Xbox", case=False, regex=True)
-    out["is_nintendo"] = pls.str.contains(r"Switch|Wii|GameCube|Nintendo|3DS", case=False, regex=True)
-    out["is_mobile"] = pls.str.contains(r"iOS|Android", case=False, regex=True)
 
+# ====================================================================================================================
+# 1. Additional function to create a platform flag dataframe (useful for ML models analysis and Hypothesis Testing)
+# ====================================================================================================================
+
+def create_platform_flags(df):
     # ----------------------------------
-    # Convert to int (0/1)
+    # All platform families, one pass
     # ----------------------------------
-    out = out.astype({
-        "is_pc": int,
-        "is_playstation": int,
-        "is_xbox": int,
-        "is_nintendo": int,
-        "is_mobile": int
-    })
+    out = tf.create_taxonomy_flags(df, "platforms_list", PLATFORM_AUTOMATON, "rawg_id", "game_name")
 
     return out
 
@@ -193,39 +194,10 @@ def create_high_rating_flag(df):
 # 6. Additional function to create a multiplayer tag flag dataframe (useful for ML models analysis and Hypothesis Testing)
 # ========================================================================================================================
 def create_multiplayer_flag(df, id_col, name_col, tags_col):
-    # ----------------------------------------------
-    # Multiplayer key-words to detect
-    # ----------------------------------------------
-    multiplayer_keywords = [
-        "multiplayer", "online", "co-op", "co op", "coop", "fps", "cooperative",
-        "mmo", "pvp", "pve", "crossplay", "lan", "battle-royale", "battle royale",
-        "survival-multiplayer"
-    ]
-
-    # ----------------------------------------------------------
-    # Build a robust unique regex (lowercase + full word search)
-    # ----------------------------------------------------------
-    pattern = r"|".join([re.escape(k.lower()) for k in multiplayer_keywords])
-
-    # -----------------------------------------
-    # Normalize the tags_list field (as string)
-    # -----------------------------------------
-    df["tags_list_norm"] = df[tags_col].astype(str).str.lower()
-
-    # ------------------------
-    # Create the binary flag
-    # ------------------------
-    df["is_multiplayer"] = df["tags_list_norm"].str.contains(pattern, regex=True).astype(int)
-
-    # ----------------------
-    # New final dataframe
-    # ----------------------
-    tag_multiplayer = df[[id_col, name_col, "is_multiplayer"]].copy()
-
-    # --------
-    # Cleanup
-    # --------
-    df.drop(columns=["tags_list_norm"], inplace=True)
+    # ---------------------------------------------------------------
+    # Whole-token keyword match on each tag (input is not modified)
+    # ---------------------------------------------------------------
+    tag_multiplayer = tf.create_taxonomy_flags(df, tags_col, MULTIPLAYER_AUTOMATON, id_col, name_col)
 
     return tag_multiplayer
 
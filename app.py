@@ -1,9 +1,17 @@
+import os
+
 from flask import Flask, jsonify, request
 from sqlalchemy import text
 import pymysql
 
+import cube_functions as cbf
+
 app = Flask(__name__)
 
+CUBE_PATH = cbf.CUBE_PATH
+_cube = None
+_cube_mtime = None
+
 # ====================================
 # Database connection
 # ====================================
@@ -16,6 +24,17 @@ def get_db_connection():
         cursorclass=pymysql.cursors.DictCursor
     )
 
+# ====================================
+# Market cube (kept in memory, reloaded when the file changes)
+# ====================================
+def get_cube():
+    global _cube, _cube_mtime
+    mtime = os.stat(CUBE_PATH).st_mtime_ns
+    if _cube is None or mtime != _cube_mtime:
+        _cube = cbf.load_cube(CUBE_PATH)
+        _cube_mtime = mtime
+    return _cube
+
 # ====================================
 # Home route
 # ====================================
@@ -25,7 +44,8 @@ def home():
         "message": "Video Games API",
         "endpoints": {
             "/games": "List games (pagination)",
-            "/games/<rawg_id>": "Game details"
+            "/games/<rawg_id>": "Game details",
+            "/cube": "Market aggregates (group_by=period,genre & platform=PC ...)"
         }
     })
 
@@ -72,6 +92,35 @@ def get_game(rawg_id):
 
     return jsonify(game)
 
+# ====================================
+# Endpoint 3: Market cube slice / roll-up
+# ====================================
+@app.route("/cube", methods=["GET"])
+def get_cube_slice():
+    group_by = [d for d in request.args.get("group_by", "").split(",") if d]
+    filters = {
+        dim: request.args.getlist(dim)
+        for dim in cbf.DIMENSIONS
+        if dim in request.args
+    }
+
+    try:
+        cube = get_cube()
+    except FileNotFoundError:
+        return jsonify({"error": "Cube not built"}), 503
+
+    try:
+        result = cbf.query_cube(cube, group_by=group_by, filters=filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result = result.astype(object).where(result.notna(), None)
+
+    return jsonify({
+        "count": len(result),
+        "results": result.to_dict(orient="records")
+    })
+
 # ====================================
 # Run app
 # ====================================
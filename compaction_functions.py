@@ -0,0 +1,322 @@
+# ==================
+# library imports
+# ==================
+
+import pandas as pd
+import numpy as np
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+
+# ============================================================
+# Columns of df_final stored as comma-joined strings
+# ============================================================
+
+LIST_COLUMNS = ["tags_list", "genres_list", "platforms_list", "store_list"]
+LIST_SEPARATOR = ", "
+
+
+# ============================================================
+# 1. Helper to pick the smallest integer dtype for a range
+# ============================================================
+
+def smallest_int_dtype(min_value, max_value, nullable=False):
+    # --------------------------------------
+    # Unsigned first (flags, counts), then signed
+    # --------------------------------------
+    if min_value >= 0:
+        candidates = ["uint8", "uint16", "uint32", "uint64"]
+    else:
+        candidates = ["int8", "int16", "int32", "int64"]
+
+    for name in candidates:
+        info = np.iinfo(name)
+        if info.min <= min_value and max_value <= info.max:
+            # ----------------------------------------------
+            # Pandas nullable dtypes are capitalised (UInt8)
+            # ----------------------------------------------
+            if nullable:
+                return name.replace("uint", "UInt") if name.startswith("uint") else name.replace("int", "Int")
+            return name
+
+    return None
+
+
+# ============================================================
+# 2. Function to dictionary-encode a comma-joined list column
+# ============================================================
+
+def encode_list_column(series, sep=LIST_SEPARATOR):
+    # --------------------------------------
+    # Only pure string columns are encoded (lossless guarantee)
+    # --------------------------------------
+    null_mask = series.isna().to_numpy()
+    values = series[~null_mask]
+    if not values.map(lambda x: isinstance(x, str)).all():
+        return None
+
+    # --------------------------------------
+    # Split every row into tokens
+    # --------------------------------------
+    tokens = values.str.split(sep, regex=False)
+    lengths = np.zeros(len(series), dtype=np.int64)
+    lengths[~null_mask] = tokens.str.len().to_numpy()
+
+    # --------------------------------------
+    # Vocabulary + codes (one code per token)
+    # --------------------------------------
+    codes, vocab = pd.factorize(tokens.explode(), sort=True)
+    code_dtype = smallest_int_dtype(0, max(len(vocab) - 1, 0))
+
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    offset_dtype = smallest_int_dtype(0, int(offsets[-1]))
+
+    return {
+        "vocab": np.asarray(vocab, dtype=object),
+        "codes": codes.astype(code_dtype),
+        "offsets": offsets.astype(offset_dtype),
+        "null_mask": null_mask,
+        "sep": sep,
+    }
+
+
+# ============================================================
+# 3. Function to rebuild the original strings from the codes
+# ============================================================
+
+def decode_list_column(encoded, index=None, name=None):
+    offsets = encoded["offsets"].astype(np.int64)
+    n_rows = len(offsets) - 1
+    lengths = np.diff(offsets)
+
+    # --------------------------------------
+    # Row id of every token, then join per row
+    # --------------------------------------
+    row_ids = np.repeat(np.arange(n_rows), lengths)
+    tokens = pd.Series(encoded["vocab"][encoded["codes"]], dtype=object)
+    joined = tokens.groupby(row_ids).agg(encoded["sep"].join)
+
+    out = pd.Series(np.nan, index=range(n_rows), dtype=object)
+    out[joined.index] = joined.to_numpy()
+    out[encoded["null_mask"]] = np.nan
+
+    if index is not None:
+        out.index = index
+    out.name = name
+
+    return out
+
+
+# ============================================================
+# 4. Function to downcast one numeric column (lossless only)
+# ============================================================
+
+def downcast_numeric_column(series):
+    # --------------------------------------
+    # Booleans are already 1 byte
+    # --------------------------------------
+    if pd.api.types.is_bool_dtype(series):
+        return series
+
+    non_null = series.dropna()
+
+    # --------------------------------------
+    # Float columns: only integral values qualify
+    # --------------------------------------
+    if pd.api.types.is_float_dtype(series):
+        if len(non_null) == 0 or not np.isfinite(non_null).all() or not (non_null % 1 == 0).all():
+            return series
+
+    if not pd.api.types.is_integer_dtype(series) and not pd.api.types.is_float_dtype(series):
+        return series
+
+    if len(non_null) == 0:
+        return series
+
+    has_nulls = len(non_null) != len(series)
+    dtype = smallest_int_dtype(int(non_null.min()), int(non_null.max()), nullable=has_nulls)
+    if dtype is None:
+        return series
+
+    # --------------------------------------
+    # Never grow a column (e.g. int8 -> UInt8 + mask)
+    # --------------------------------------
+    candidate = series.astype(dtype)
+    if candidate.memory_usage(index=False, deep=True) >= series.memory_usage(index=False, deep=True):
+        return series
+
+    return candidate
+
+
+# ============================================================
+# 5. Function to compact a dataframe (df_final or a flag frame)
+# ============================================================
+
+def compact_dataframe(df, list_cols=None, max_category_ratio=0.5, drop_cols=None, key="rawg_id"):
+    # --------------------------------------
+    # Default list columns = those present in df
+    # --------------------------------------
+    if list_cols is None:
+        list_cols = [c for c in LIST_COLUMNS if c in df.columns]
+
+    # --------------------------------------
+    # Identifier columns duplicated from df_final (game_name in a flag
+    # frame): unique strings, incompressible, re-joined on the key
+    # --------------------------------------
+    drop_cols = [c for c in (drop_cols or []) if c in df.columns and c != key]
+    if drop_cols and key not in df.columns:
+        raise ValueError(f"drop_cols needs the key column '{key}' to re-join them")
+
+    meta = {
+        "columns": list(df.columns),
+        "dtypes": df.dtypes.to_dict(),
+        "lists": {},
+        "none_rows": {},
+        "dropped": {"key": key, "columns": drop_cols},
+    }
+
+    out = pd.DataFrame(index=df.index)
+
+    for col in df.columns:
+        series = df[col]
+        if col in drop_cols:
+            continue
+
+        # ----------------------------------
+        # Category and list codes only keep NaN:
+        # remember where the original held None
+        # ----------------------------------
+        if is_object_dtype(series):
+            none_rows = np.flatnonzero(series.map(lambda x: x is None).to_numpy(dtype=bool))
+            if len(none_rows):
+                meta["none_rows"][col] = none_rows
+
+        # ----------------------------------
+        # List columns -> dictionary codes
+        # ----------------------------------
+        if col in list_cols:
+            encoded = encode_list_column(series)
+            if encoded is not None:
+                meta["lists"][col] = encoded
+                continue
+
+        # ----------------------------------
+        # Low-cardinality strings -> category
+        # ----------------------------------
+        if is_object_dtype(series) or is_string_dtype(series):
+            non_null = series.dropna()
+            is_str = non_null.map(lambda x: isinstance(x, str)).all()
+            if is_str and len(non_null) > 0 and non_null.nunique() / len(non_null) <= max_category_ratio:
+                out[col] = series.astype("category")
+            else:
+                out[col] = series
+            continue
+
+        # ----------------------------------
+        # Counts and flags -> smallest ints
+        # ----------------------------------
+        out[col] = downcast_numeric_column(series)
+
+    return out, meta
+
+
+# ============================================================
+# 6. Function to restore the original dataframe
+# ============================================================
+
+def restore_dataframe(df_compact, meta, source=None):
+    # --------------------------------------
+    # Dropped identifier columns come back from the source frame
+    # --------------------------------------
+    dropped = meta.get("dropped", {"key": None, "columns": []})
+    if dropped["columns"]:
+        if source is None:
+            raise ValueError(f"restore_dataframe needs source= to restore {dropped['columns']}")
+        key = dropped["key"]
+        lookup = source.drop_duplicates(subset=[key]).set_index(key)[dropped["columns"]]
+        rejoined = lookup.reindex(df_compact[key].astype(source[key].dtype).to_numpy())
+        rejoined.index = df_compact.index
+
+    out = pd.DataFrame(index=df_compact.index)
+
+    for col in meta["columns"]:
+        if col in meta["lists"]:
+            out[col] = decode_list_column(meta["lists"][col], index=df_compact.index, name=col)
+        elif col in dropped["columns"]:
+            out[col] = rejoined[col]
+        else:
+            out[col] = df_compact[col]
+
+        # ----------------------------------
+        # Back to the exact original dtype
+        # ----------------------------------
+        original = meta["dtypes"][col]
+        if out[col].dtype != original:
+            out[col] = out[col].astype(original)
+
+        # ----------------------------------
+        # Original null sentinel (None vs NaN)
+        # ----------------------------------
+        none_rows = meta.get("none_rows", {}).get(col)
+        if none_rows is not None:
+            values = out[col].to_numpy(dtype=object, copy=True)
+            values[none_rows] = None
+            out[col] = pd.Series(values, index=out.index, dtype=object, name=col)
+
+    return out
+
+
+# ============================================================
+# 7. Memory report (before / after, per column + total)
+# ============================================================
+
+def encoded_nbytes(encoded):
+    vocab_bytes = sum(len(v.encode("utf-8")) + 49 for v in encoded["vocab"])  # ~ sys.getsizeof of a str
+    return (
+        vocab_bytes
+        + encoded["vocab"].nbytes
+        + encoded["codes"].nbytes
+        + encoded["offsets"].nbytes
+        + encoded["null_mask"].nbytes
+    )
+
+
+def memory_report(df, df_compact, meta):
+    before = df.memory_usage(index=False, deep=True)
+
+    rows = []
+    for col in meta["columns"]:
+        if col in meta["lists"]:
+            after_bytes = encoded_nbytes(meta["lists"][col])
+            after_dtype = "list_codes[" + str(meta["lists"][col]["codes"].dtype) + "]"
+        elif col in meta.get("dropped", {}).get("columns", []):
+            after_bytes = 0
+            after_dtype = "dropped (join on " + meta["dropped"]["key"] + ")"
+        else:
+            after_bytes = df_compact[col].memory_usage(index=False, deep=True)
+            after_dtype = str(df_compact[col].dtype)
+
+        rows.append({
+            "column": col,
+            "dtype_before": str(df[col].dtype),
+            "dtype_after": after_dtype,
+            "bytes_before": int(before[col]),
+            "bytes_after": int(after_bytes),
+        })
+
+    report = pd.DataFrame(rows)
+
+    # --------------------------------------
+    # Total row + reduction factor
+    # --------------------------------------
+    total = pd.DataFrame([{
+        "column": "TOTAL",
+        "dtype_before": "",
+        "dtype_after": "",
+        "bytes_before": int(report["bytes_before"].sum()),
+        "bytes_after": int(report["bytes_after"].sum()),
+    }])
+    report = pd.concat([report, total], ignore_index=True)
+    report["reduction_factor"] = (report["bytes_before"] / report["bytes_after"].replace(0, np.nan)).round(2)
+
+    return report
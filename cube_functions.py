@@ -0,0 +1,344 @@
+# ==================
+# library imports
+# ==================
+
+import os
+import sys
+import pickle
+
+import pandas as pd
+import numpy as np
+
+
+# ============================================================
+# Cube layout
+# ============================================================
+# Every dimension has an "ALL" member at index 0. A game is added to
+# its own members *and* to ALL on every axis, so a question that does
+# not group by genre / platform / store reads the ALL slot and counts
+# each game once, even though those columns hold several values.
+
+ALL = "ALL"
+UNKNOWN = "Unknown"
+
+DIMENSIONS = ["period", "genre", "platform", "store", "esrb"]
+MULTI_VALUED = {"genre", "platform", "store"}
+
+SOURCE_COLUMNS = {
+    "genre": "genres_list",
+    "platform": "platforms_list",
+    "store": "store_list",
+    "esrb": "esrb_rating_list",
+}
+
+# Last applied row of every game, kept in the cube so a game can be
+# retracted by rawg_id alone
+ROW_COLUMNS = ["rawg_id", "release_date", *SOURCE_COLUMNS.values(), "user_rating", "avg_playtime_hours"]
+
+CUBE_PATH = "market_cube.pkl"
+
+MEASURES = ["count", "rating_sum", "rated_count", "playtime_sum"]
+MEASURE_DTYPES = {
+    "count": np.int32,
+    "rating_sum": np.float64,
+    "rated_count": np.int32,
+    "playtime_sum": np.float64,
+}
+
+
+# ============================================================
+# 1. Function to extract the members of each game on each axis
+# ============================================================
+
+def extract_members(df, time_grain="year"):
+    members = {}
+
+    # --------------------------------------
+    # Period from release_date (dd-mm-yyyy after cleaning)
+    # --------------------------------------
+    dates = pd.to_datetime(df["release_date"], format="%d-%m-%Y", errors="coerce")
+    if time_grain == "month":
+        period = dates.dt.strftime("%Y-%m")
+    else:
+        period = dates.dt.year.astype("Int64").astype(str)
+    period = period.where(dates.notna(), UNKNOWN)
+    members["period"] = period.map(lambda x: [x])
+
+    # --------------------------------------
+    # Comma-joined lists -> python lists
+    # --------------------------------------
+    def split_values(x):
+        if not isinstance(x, str):
+            return [UNKNOWN]
+        values = [v.strip() for v in x.split(",") if v.strip()]
+        return values or [UNKNOWN]
+
+    for dim in ("genre", "platform", "store"):
+        members[dim] = df[SOURCE_COLUMNS[dim]].map(split_values)
+
+    esrb = df[SOURCE_COLUMNS["esrb"]]
+    members["esrb"] = esrb.map(lambda x: [x] if isinstance(x, str) and x else [UNKNOWN])
+
+    return members
+
+
+# ============================================================
+# 2. Function to create an empty cube
+# ============================================================
+
+def empty_cube(time_grain="year"):
+    return {
+        "time_grain": time_grain,
+        "members": {dim: [ALL] for dim in DIMENSIONS},
+        "lookup": {dim: {ALL: 0} for dim in DIMENSIONS},
+        "measures": {m: np.zeros((1,) * len(DIMENSIONS), dtype=MEASURE_DTYPES[m]) for m in MEASURES},
+        "rows": pd.DataFrame(columns=ROW_COLUMNS).set_index("rawg_id"),
+    }
+
+
+def register_members(cube, members):
+    # --------------------------------------
+    # New members are appended: existing codes never move
+    # --------------------------------------
+    grown = False
+    for dim in DIMENSIONS:
+        lookup = cube["lookup"][dim]
+        for values in members[dim]:
+            for v in values:
+                if v not in lookup:
+                    lookup[v] = len(cube["members"][dim])
+                    cube["members"][dim].append(v)
+                    grown = True
+
+    if grown:
+        shape = tuple(len(cube["members"][dim]) for dim in DIMENSIONS)
+        for m in MEASURES:
+            old = cube["measures"][m]
+            pad = [(0, new - cur) for new, cur in zip(shape, old.shape)]
+            cube["measures"][m] = np.pad(old, pad)
+
+
+# ============================================================
+# 3. Function to add (or remove) games to the cube
+# ============================================================
+
+def apply_games(cube, df, sign=1, chunk_size=20000):
+    members = extract_members(df, cube["time_grain"])
+    register_members(cube, members)
+
+    shape = cube["measures"]["count"].shape
+    size = int(np.prod(shape))
+
+    rating = df["user_rating"].fillna(0).to_numpy(dtype=np.float64)
+    rated = (rating > 0).astype(np.float64)
+    playtime = df["avg_playtime_hours"].fillna(0).to_numpy(dtype=np.float64)
+
+    n = len(df)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+
+        # ----------------------------------
+        # (game, code) per axis, ALL included, then cartesian product
+        # through successive merges on the game row
+        # ----------------------------------
+        cells = None
+        for dim in DIMENSIONS:
+            lookup = cube["lookup"][dim]
+            codes = members[dim].iloc[start:stop].map(lambda vals: [0] + [lookup[v] for v in vals])
+            axis = pd.DataFrame({"g": np.arange(start, stop), dim: codes.to_numpy()}).explode(dim)
+            axis = axis.drop_duplicates()
+            cells = axis if cells is None else cells.merge(axis, on="g")
+
+        flat = np.ravel_multi_index([cells[dim].to_numpy(dtype=np.int64) for dim in DIMENSIONS], shape)
+        g = cells["g"].to_numpy()
+
+        # ----------------------------------
+        # Scatter-add all measures at once
+        # ----------------------------------
+        weights = {
+            "count": None,
+            "rating_sum": rating[g],
+            "rated_count": rated[g],
+            "playtime_sum": playtime[g],
+        }
+        for m in MEASURES:
+            delta = np.bincount(flat, weights=weights[m], minlength=size).reshape(shape)
+            cube["measures"][m] += (sign * delta).astype(MEASURE_DTYPES[m])
+
+    # --------------------------------------
+    # Keep exactly what was added, to retract it later
+    # --------------------------------------
+    rows = cube["rows"]
+    rows = rows.drop(index=df["rawg_id"], errors="ignore")
+    if sign > 0:
+        applied = df.reindex(columns=ROW_COLUMNS).set_index("rawg_id")
+        rows = applied if rows.empty else pd.concat([rows, applied])
+    cube["rows"] = rows
+
+    return cube
+
+
+def build_cube(df, time_grain="year"):
+    df = df.drop_duplicates(subset=["rawg_id"], keep="last")
+    return apply_games(empty_cube(time_grain), df)
+
+
+# ============================================================
+# 4. Incremental refresh (new + modified games)
+# ============================================================
+
+def retract_games(cube, rawg_ids):
+    # --------------------------------------
+    # Subtract the last applied version of each game
+    # --------------------------------------
+    rows = cube["rows"]
+    old = rows[rows.index.isin(list(rawg_ids))].reset_index()
+    if len(old):
+        apply_games(cube, old, sign=-1)
+    return cube
+
+
+def refresh_cube(cube, df_new):
+    # --------------------------------------
+    # Modified games: previous version out, new version in
+    # --------------------------------------
+    df_new = df_new.drop_duplicates(subset=["rawg_id"], keep="last")
+    retract_games(cube, df_new["rawg_id"])
+    if len(df_new):
+        apply_games(cube, df_new, sign=1)
+
+    return cube
+
+
+# ============================================================
+# 5. Roll-up / slice query
+# ============================================================
+
+def query_cube(cube, group_by=None, filters=None):
+    group_by = list(group_by or [])
+    filters = dict(filters or {})
+
+    for dim in group_by + list(filters):
+        if dim not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dim}' (expected one of {DIMENSIONS})")
+
+    # --------------------------------------
+    # Indices to read on every axis
+    # --------------------------------------
+    selectors = []
+    for dim in DIMENSIONS:
+        lookup = cube["lookup"][dim]
+        wanted = filters.get(dim)
+        if wanted is not None and not isinstance(wanted, (list, tuple, set)):
+            wanted = [wanted]
+        if wanted is not None:
+            wanted = [str(w) for w in wanted]
+
+        if dim in group_by:
+            names = wanted if wanted is not None else cube["members"][dim][1:]
+            selectors.append([lookup[v] for v in names if v in lookup])
+        elif wanted is not None:
+            # ------------------------------
+            # Summing several members of a multi-valued axis
+            # would count a game once per member
+            # ------------------------------
+            if dim in MULTI_VALUED and len(wanted) > 1:
+                raise ValueError(f"Filter on '{dim}' accepts a single value unless '{dim}' is grouped")
+            selectors.append([lookup[v] for v in wanted if v in lookup])
+        else:
+            selectors.append([0])
+
+    index = np.ix_(*selectors)
+    filtered_axes = tuple(
+        i for i, dim in enumerate(DIMENSIONS) if dim not in group_by
+    )
+
+    values = {m: cube["measures"][m][index].sum(axis=filtered_axes, dtype=np.float64) for m in MEASURES}
+
+    # --------------------------------------
+    # Dense result -> tidy dataframe (non-empty cells only)
+    # --------------------------------------
+    group_selectors = [selectors[DIMENSIONS.index(dim)] for dim in DIMENSIONS if dim in group_by]
+    group_dims = [dim for dim in DIMENSIONS if dim in group_by]
+
+    if group_dims:
+        grid = np.meshgrid(*[np.arange(len(s)) for s in group_selectors], indexing="ij")
+        out = pd.DataFrame({
+            dim: np.asarray(cube["members"][dim], dtype=object)[np.asarray(group_selectors[k])[grid[k].ravel()]]
+            for k, dim in enumerate(group_dims)
+        })
+    else:
+        out = pd.DataFrame(index=[0])
+
+    for m in MEASURES:
+        out[m] = np.asarray(values[m]).ravel()
+
+    out = out[out["count"] > 0].reset_index(drop=True)
+    out["count"] = out["count"].round().astype(int)
+    out["rated_count"] = out["rated_count"].round().astype(int)
+
+    # --------------------------------------
+    # Derived measures
+    # --------------------------------------
+    out["rating_mean"] = (out["rating_sum"] / out["rated_count"].replace(0, np.nan)).round(2)
+    out["playtime_mean"] = (out["playtime_sum"] / out["count"]).round(2)
+
+    return out[group_dims + ["count", "rated_count", "rating_mean", "playtime_mean", "rating_sum", "playtime_sum"]]
+
+
+# ============================================================
+# 6. Persistence
+# ============================================================
+
+def save_cube(cube, path=CUBE_PATH):
+    # --------------------------------------
+    # Write then rename: the API never reads half a file
+    # --------------------------------------
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(cube, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_cube(path=CUBE_PATH):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# ============================================================
+# 7. Build / refresh the cube file read by the API
+# ============================================================
+
+def build_cube_file(df, path=CUBE_PATH, time_grain="year"):
+    cube = build_cube(df, time_grain=time_grain)
+    save_cube(cube, path)
+    return cube
+
+
+def refresh_cube_file(df_new, path=CUBE_PATH):
+    # --------------------------------------
+    # Never start from an empty cube: it would hold only the changed
+    # games and /cube would serve them as the whole market
+    # --------------------------------------
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Cube file '{path}' not found: build it first with build_cube_file "
+            f"(python cube_functions.py df_tableau.csv {path})"
+        )
+
+    cube = load_cube(path)
+    refresh_cube(cube, df_new)
+    save_cube(cube, path)
+    return cube
+
+
+# ==============================================================
+# Main (full build from the exported dataframe, e.g.
+# python cube_functions.py df_tableau.csv market_cube.pkl)
+# ==============================================================
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "df_tableau.csv"
+    cube_path = sys.argv[2] if len(sys.argv) > 2 else CUBE_PATH
+    cube = build_cube_file(pd.read_csv(csv_path), path=cube_path)
+    print(f"{len(cube['rows']):,} games -> {cube_path}")
@@ -0,0 +1,276 @@
+# ==================
+# library imports
+# ==================
+
+import re
+import unicodedata
+
+import pandas as pd
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+# ============================================================
+# Words that change between stores but not the game itself
+# ============================================================
+
+# Generic adjectives ("Gold", "Ultimate") only count when followed by "edition"
+EDITION_PATTERN = re.compile(
+    r"\b(complete|definitive|deluxe|ultimate|gold|premium|standard|enhanced|"
+    r"special|collector s|anniversary|digital) edition\b"
+    r"|\b(game of the year|goty|remastered|director s cut|edition)\b"
+)
+
+ROMAN_NUMERALS = {"ii": "2", "iii": "3", "iv": "4", "vi": "6", "vii": "7", "viii": "8", "ix": "9"}
+
+# "v" is also a word / letter ("V Rising", "Mega Man X"): converted only as the
+# last token of a longer title (Grand Theft Auto V), "x" never
+TRAILING_ROMAN_NUMERALS = {"v": "5"}
+
+# Tokens too common to identify a game on their own
+STOP_TOKENS = {"the", "a", "an", "of", "and", "in", "on", "to", "for", "game"}
+
+
+# ============================================================
+# 1. Function to normalize game names
+# ============================================================
+
+def normalize_game_name(names):
+    # --------------------------------------
+    # Accents, trademarks, case
+    # --------------------------------------
+    s = names.fillna("").astype(str).map(
+        lambda x: unicodedata.normalize("NFKD", x).encode("ascii", "ignore").decode("ascii")
+    )
+    s = s.str.lower().str.replace("&", " and ", regex=False)
+
+    # --------------------------------------
+    # Punctuation -> space, editions removed
+    # --------------------------------------
+    s = s.str.replace(r"[^a-z0-9]+", " ", regex=True)
+    s = s.str.replace(EDITION_PATTERN, " ", regex=True)
+
+    # --------------------------------------
+    # Roman numerals -> digits (Final Fantasy VII == 7)
+    # --------------------------------------
+    s = s.map(replace_roman_numerals)
+
+    return s
+
+
+def replace_roman_numerals(name):
+    tokens = [ROMAN_NUMERALS.get(t, t) for t in name.split()]
+    if len(tokens) > 1:
+        tokens[-1] = TRAILING_ROMAN_NUMERALS.get(tokens[-1], tokens[-1])
+    return " ".join(tokens)
+
+
+def extract_year(dates):
+    # --------------------------------------
+    # Works for RAWG (dd-mm-yyyy) and Steam (21 Aug, 2012)
+    # --------------------------------------
+    years = dates.astype(str).str.extract(r"\b(19\d{2}|20\d{2})\b")[0]
+    return years.astype(float).fillna(-1).astype(int)
+
+
+# ============================================================
+# 2. Function to explode names into (row, token, year) rows
+# ============================================================
+
+def explode_tokens(names_norm, years):
+    tokens = names_norm.str.split()
+    out = pd.DataFrame({"row": np.arange(len(names_norm)), "token": tokens.to_numpy(), "year": years.to_numpy()})
+    out = out.explode("token").dropna(subset=["token"])
+    out = out[~out["token"].isin(STOP_TOKENS)].drop_duplicates(["row", "token"])
+    return out
+
+
+def count_tokens(tokens, n_rows):
+    # Same token set as the blocking index, so Jaccard stays in [0, 1]
+    return tokens.groupby("row").size().reindex(range(n_rows), fill_value=0).to_numpy()
+
+
+# ============================================================
+# 3. Function to build the blocking index on RAWG games
+# ============================================================
+
+def build_blocking_index(df_rawg, name_col="game_name", date_col="release_date", max_block_size=5000):
+    names_norm = normalize_game_name(df_rawg[name_col])
+    years = extract_year(df_rawg[date_col])
+
+    tokens = explode_tokens(names_norm, years)
+
+    # --------------------------------------
+    # Drop tokens present in too many games (no blocking power)
+    # --------------------------------------
+    token_freq = tokens["token"].value_counts()
+    index = tokens[tokens["token"].map(token_freq) <= max_block_size]
+
+    # --------------------------------------
+    # Char trigram TF-IDF, fitted once on the catalog
+    # --------------------------------------
+    vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 3), dtype=np.float32)
+    vectors = vectorizer.fit_transform(names_norm)
+
+    return {
+        "index": index,
+        "names_norm": names_norm.to_numpy(),
+        "years": years.to_numpy(),
+        "token_counts": count_tokens(tokens, len(df_rawg)),
+        "vectorizer": vectorizer,
+        "vectors": vectors,
+        "rawg_ids": df_rawg["rawg_id"].to_numpy(),
+        "rawg_names": df_rawg[name_col].to_numpy(),
+    }
+
+
+# ============================================================
+# 4. Function to generate candidate pairs from the index
+# ============================================================
+
+def generate_candidates(blocking, ext_tokens, year_tolerance=1, max_candidates=20):
+    index = blocking["index"]
+
+    # --------------------------------------
+    # Known year: same token and year +/- tolerance
+    # --------------------------------------
+    with_year = ext_tokens[ext_tokens["year"] >= 0]
+    shifted = pd.concat(
+        [with_year.assign(year=with_year["year"] + d) for d in range(-year_tolerance, year_tolerance + 1)],
+        ignore_index=True
+    )
+    pairs_year = shifted.merge(index, on=["token", "year"], suffixes=("_ext", "_rawg"))
+
+    # --------------------------------------
+    # Unknown year (either side): token only
+    # --------------------------------------
+    no_year_ext = ext_tokens[ext_tokens["year"] < 0].drop(columns="year")
+    pairs_no_year = no_year_ext.merge(index.drop(columns="year"), on="token", suffixes=("_ext", "_rawg"))
+    pairs_rawg_no_year = with_year.drop(columns="year").merge(
+        index[index["year"] < 0].drop(columns="year"), on="token", suffixes=("_ext", "_rawg")
+    )
+
+    # --------------------------------------
+    # Known year but nothing in the year block (store re-release,
+    # wrong date on one side): fall back on token only, the
+    # same_year feature still ranks the candidates
+    # --------------------------------------
+    no_block = with_year[~with_year["row"].isin(pairs_year["row_ext"])].drop(columns="year")
+    pairs_fallback = no_block.merge(index.drop(columns="year"), on="token", suffixes=("_ext", "_rawg"))
+
+    pairs = pd.concat(
+        [pairs_year[["row_ext", "row_rawg", "token"]], pairs_no_year, pairs_rawg_no_year, pairs_fallback],
+        ignore_index=True
+    ).drop_duplicates(["row_ext", "row_rawg", "token"])
+
+    # --------------------------------------
+    # Keep the candidates sharing the most tokens
+    # --------------------------------------
+    pairs = pairs.groupby(["row_ext", "row_rawg"], sort=False).size().rename("shared_tokens").reset_index()
+    pairs = pairs.sort_values(["row_ext", "shared_tokens"], ascending=[True, False])
+    pairs = pairs.groupby("row_ext", sort=False).head(max_candidates)
+
+    return pairs.reset_index(drop=True)
+
+
+# ============================================================
+# 5. Function to score candidate pairs (vectorized)
+# ============================================================
+
+def score_candidates(blocking, pairs, ext_vectors, ext_token_counts, ext_years):
+    e = pairs["row_ext"].to_numpy()
+    r = pairs["row_rawg"].to_numpy()
+
+    # --------------------------------------
+    # Cosine of L2-normalized TF-IDF rows = row-wise dot product
+    # --------------------------------------
+    cosine = np.asarray(ext_vectors[e].multiply(blocking["vectors"][r]).sum(axis=1)).ravel()
+
+    # --------------------------------------
+    # Token Jaccard from the shared token count
+    # --------------------------------------
+    shared = pairs["shared_tokens"].to_numpy()
+    union = ext_token_counts[e] + blocking["token_counts"][r] - shared
+    jaccard = shared / np.maximum(union, 1)
+
+    # --------------------------------------
+    # Same release year bonus
+    # --------------------------------------
+    year_ext = ext_years[e]
+    year_rawg = blocking["years"][r]
+    same_year = ((year_ext == year_rawg) & (year_ext >= 0)).astype(float)
+
+    scored = pairs.copy()
+    scored["cosine"] = cosine.round(4)
+    scored["jaccard"] = jaccard.round(4)
+    scored["same_year"] = same_year
+    scored["score"] = (0.6 * scored["cosine"] + 0.3 * scored["jaccard"] + 0.1 * scored["same_year"]).round(4)
+
+    return scored
+
+
+# ============================================================
+# 6. Complete matching: external titles -> rawg_id
+# ============================================================
+
+def match_external_titles(df_external, blocking, name_col="game_name", date_col="release_date",
+                          id_col=None, threshold=0.75, max_candidates=20, chunk_size=20000):
+    ext_names_norm = normalize_game_name(df_external[name_col])
+    ext_years = extract_year(df_external[date_col]) if date_col in df_external.columns \
+        else pd.Series(-1, index=df_external.index)
+
+    ext_vectors = blocking["vectorizer"].transform(ext_names_norm)
+    ext_years_np = ext_years.to_numpy()
+
+    ext_tokens = explode_tokens(ext_names_norm, ext_years)
+    ext_token_counts = count_tokens(ext_tokens, len(df_external))
+
+    # --------------------------------------
+    # Chunks of external rows keep the pair table small
+    # --------------------------------------
+    best = []
+    n = len(df_external)
+    for start in range(0, n, chunk_size):
+        chunk = ext_tokens[(ext_tokens["row"] >= start) & (ext_tokens["row"] < start + chunk_size)]
+        pairs = generate_candidates(blocking, chunk, max_candidates=max_candidates)
+        if pairs.empty:
+            continue
+
+        scored = score_candidates(blocking, pairs, ext_vectors, ext_token_counts, ext_years_np)
+        scored = scored.sort_values(["row_ext", "score"], ascending=[True, False])
+
+        # ----------------------------------
+        # Margin over the runner-up = ambiguity
+        # ----------------------------------
+        rank = scored.groupby("row_ext", sort=False).cumcount()
+        second = scored[rank == 1].set_index("row_ext")["score"]
+        top = scored[rank == 0].set_index("row_ext")
+        top["margin"] = (top["score"] - second.reindex(top.index).fillna(0)).round(4)
+        best.append(top)
+
+    columns = ["row_ext", "row_rawg", "shared_tokens", "cosine", "jaccard", "same_year", "score", "margin"]
+    best = pd.concat(best) if best else pd.DataFrame(columns=columns).set_index("row_ext")
+
+    # --------------------------------------
+    # Final match table (one row per external title)
+    # --------------------------------------
+    table = pd.DataFrame({
+        "external_id": df_external[id_col].to_numpy() if id_col else df_external.index.to_numpy(),
+        "external_name": df_external[name_col].to_numpy(),
+    })
+    table = table.join(best)
+
+    matched_rows = table["row_rawg"].notna()
+    rows = table.loc[matched_rows, "row_rawg"].astype(int).to_numpy()
+    table["rawg_id"] = pd.Series(pd.NA, index=table.index, dtype="Int64")
+    table.loc[matched_rows, "rawg_id"] = blocking["rawg_ids"][rows]
+    table["game_name"] = None
+    table.loc[matched_rows, "game_name"] = blocking["rawg_names"][rows]
+
+    table["score"] = table["score"].fillna(0.0)
+    table["is_match"] = (table["score"] >= threshold).astype(int)
+
+    return table[[
+        "external_id", "external_name", "rawg_id", "game_name",
+        "score", "margin", "cosine", "jaccard", "same_year", "shared_tokens", "is_match"
+    ]]
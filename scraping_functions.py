@@ -0,0 +1,307 @@
+# ==================
+# library imports
+# ==================
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+import requests
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401  (C parser, much faster than html.parser)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# Skip the Steam age gate on mature titles
+STEAM_COOKIES = {"birthtime": "0", "lastagecheckage": "1-0-1990", "mature_content": "1"}
+
+CACHE_DIR = "steam_cache"
+
+
+# ============================================================
+# 1. On-disk HTTP cache (body + validators per URL)
+# ============================================================
+
+def cache_paths(cache_dir, url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".html"), os.path.join(cache_dir, key + ".json")
+
+
+def read_cache(cache_dir, url):
+    body_path, meta_path = cache_paths(cache_dir, url)
+    if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+        return None, None
+
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(body_path, "r", encoding="utf-8") as f:
+        body = f.read()
+
+    return body, meta
+
+
+def write_cache(cache_dir, url, body, response):
+    os.makedirs(cache_dir, exist_ok=True)
+    body_path, meta_path = cache_paths(cache_dir, url)
+
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+
+    # --------------------------------------
+    # Write then rename: a crash never leaves half a file.
+    # Unique temp name: two threads may fetch the same URL
+    # --------------------------------------
+    for path, content in ((body_path, body), (meta_path, json.dumps(meta))):
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+
+# ============================================================
+# 2. Per-host politeness (max in flight + min delay)
+# ============================================================
+
+class HostLimiter:
+    def __init__(self, max_per_host=2, min_delay=0.5):
+        self.max_per_host = max_per_host
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_slot = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._next_slot[host] = 0.0
+            return self._semaphores[host]
+
+    def acquire(self, host):
+        self._semaphore(host).acquire()
+
+        # ----------------------------------
+        # Reserve the next start time for this host
+        # ----------------------------------
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot[host])
+            self._next_slot[host] = start + self.min_delay
+
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host):
+        self._semaphores[host].release()
+
+
+# ============================================================
+# 3. Function to fetch one page (conditional request + retries)
+# ============================================================
+
+_thread_state = threading.local()
+
+
+def get_session():
+    # requests.Session is not thread-safe: one per worker thread
+    if not hasattr(_thread_state, "session"):
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        session.cookies.update(STEAM_COOKIES)
+        _thread_state.session = session
+    return _thread_state.session
+
+
+def fetch_page(url, limiter, cache_dir=CACHE_DIR, max_retries=3, timeout=15, backoff=1.0):
+    """Return (html, from_cache, error) for a URL, revalidating any cached copy."""
+    cached_body, meta = read_cache(cache_dir, url) if cache_dir else (None, None)
+
+    # --------------------------------------
+    # Conditional headers from the cached validators
+    # --------------------------------------
+    headers = {}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    host = urlparse(url).netloc
+    error = None
+
+    for attempt in range(max_retries):
+        limiter.acquire(host)
+        try:
+            response = get_session().get(url, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            response = None
+            error = f"network_error: {type(e).__name__}"
+        except requests.exceptions.RequestException as e:
+            # --------------------------
+            # Redirect loop, invalid URL...: retrying will not help
+            # --------------------------
+            return None, False, f"request_error: {type(e).__name__}"
+        finally:
+            limiter.release(host)
+
+        # ----------------------------------
+        # 304: cached copy is still valid
+        # ----------------------------------
+        if response is not None and response.status_code == 304 and cached_body is not None:
+            return cached_body, True, None
+
+        if response is not None and response.status_code == 200:
+            if cache_dir:
+                write_cache(cache_dir, url, response.text, response)
+            return response.text, False, None
+
+        # ----------------------------------
+        # Retry only network errors, 429 and 5xx
+        # ----------------------------------
+        if response is not None:
+            error = f"http_{response.status_code}"
+            if response.status_code != 429 and response.status_code < 500:
+                # 404 / 410...: the page is gone, never serve a stale copy
+                return None, False, error
+
+        if attempt < max_retries - 1:
+            time.sleep(backoff * 2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
+
+    # --------------------------------------
+    # Server unreachable or failing: fall back on the stale copy
+    # --------------------------------------
+    if cached_body is not None:
+        return cached_body, True, None
+
+    return None, False, error
+
+
+# ============================================================
+# 4. Function to parse a Steam-like store page
+# ============================================================
+
+def text_or_none(node):
+    return node.get_text(strip=True) if node else None
+
+
+def parse_store_page(html, url=None):
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    # -------------------------
+    # Developer / Publisher
+    # -------------------------
+    developers = []
+    publishers = []
+    for row in soup.find_all("div", class_="dev_row"):
+        label = row.find("div", class_="subtitle")
+        values = [a.get_text(strip=True) for a in row.find_all("a")]
+        if label and "Developer" in label.text:
+            developers = values
+        if label and "Publisher" in label.text:
+            publishers = values
+
+    # -------------------------
+    # Price (discounted price first)
+    # -------------------------
+    price = text_or_none(
+        soup.find("div", class_="discount_final_price") or soup.find("div", class_="game_purchase_price")
+    )
+
+    # -------------------------
+    # Review summary + count
+    # -------------------------
+    review_count = soup.find("meta", attrs={"itemprop": "reviewCount"})
+    review_count = int(review_count["content"]) if review_count and review_count.get("content", "").isdigit() else None
+
+    app_id = re.search(r"/app/(\d+)", url) if url else None
+
+    return {
+        "url": url,
+        "app_id": int(app_id.group(1)) if app_id else None,
+        "game_name": text_or_none(soup.find("div", class_="apphub_AppName")),
+        "release_date": text_or_none(soup.find("div", class_="date")),
+        "price": price,
+        "review_summary": text_or_none(soup.find("span", class_="game_review_summary")),
+        "review_count": review_count,
+        "developers": developers,
+        "publishers": publishers,
+        "tags": [t.get_text(strip=True) for t in soup.find_all("a", class_="app_tag")],
+    }
+
+
+# ============================================================
+# 5. Concurrent scraper: yields records as pages complete
+# ============================================================
+
+def scrape_store_pages(urls, max_workers=8, max_per_host=2, min_delay=0.5, cache_dir=CACHE_DIR,
+                       max_retries=3, backoff=1.0):
+    limiter = HostLimiter(max_per_host=max_per_host, min_delay=min_delay)
+
+    # --------------------------------------
+    # A failing URL becomes an error record, it never stops the stream
+    # --------------------------------------
+    def work(url):
+        try:
+            html, from_cache, error = fetch_page(
+                url, limiter, cache_dir=cache_dir, max_retries=max_retries, backoff=backoff
+            )
+        except Exception as e:
+            return {"url": url, "error": f"fetch_failed: {type(e).__name__}: {e}"}
+        if html is None:
+            return {"url": url, "error": error or "fetch_failed"}
+
+        try:
+            record = parse_store_page(html, url)
+        except Exception as e:
+            return {"url": url, "error": f"parse_failed: {type(e).__name__}: {e}"}
+        record["from_cache"] = from_cache
+        return record
+
+    # --------------------------------------
+    # Bounded window of futures: memory stays flat
+    # even for a very long URL iterator
+    # --------------------------------------
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        for url in urls:
+            pending.add(pool.submit(work, url))
+            if len(pending) >= max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def scrape_to_jsonl(urls, output_path, **kwargs):
+    # --------------------------------------
+    # Stream records straight to disk
+    # --------------------------------------
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        for record in scrape_store_pages(urls, **kwargs):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
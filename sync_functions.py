@@ -0,0 +1,465 @@
+# ==================
+# library imports
+# ==================
+
+import os
+import time
+
+import requests
+import pandas as pd
+import numpy as np
+from sqlalchemy import create_engine, table, column, select, delete, insert, func
+from sqlalchemy.dialects import mysql, sqlite
+
+import cleaning_functions as cf
+import merging_function as mf
+import cube_functions as cbf
+
+
+RAWG_BASE_URL = os.environ.get("RAWG_BASE_URL", "https://api.rawg.io/api")
+RAWG_API_KEY = os.environ.get("RAWG_API_KEY", "api_key_here")
+DATABASE_URL = os.environ.get("DATABASE_URL", "mysql+pymysql://root@localhost:3306/video_game_market")
+
+# First run on a database without sync_state nor games.last_updated
+# (e.g. loaded by Filling_Tables.sql): "2026-01-15T00:00:00"
+SYNC_BOOTSTRAP = os.environ.get("RAWG_SYNC_BOOTSTRAP")
+
+SYNC_SOURCE = "rawg_games"
+
+
+# ============================================================
+# Tables touched by the sync (see Table_Creation.sql)
+# ============================================================
+
+GAMES = table(
+    "games",
+    column("game_id"), column("rawg_id"), column("game_name"), column("release_date"),
+    column("user_rating"), column("ratings_count"), column("avg_playtime_hours"), column("last_updated"),
+)
+SYNC_STATE = table("sync_state", column("source"), column("high_watermark"))
+
+# dimension -> (dimension table, id column, name column, bridge table, list column in df_final)
+DIMENSIONS = {
+    "genres": ("genres", "genre_id", "genre_name", "game_genres", "genres_list"),
+    "platforms": ("platforms", "platform_id", "platform_name", "game_platforms", "platforms_list"),
+    "stores": ("stores", "store_id", "store_name", "game_stores", "store_list"),
+}
+
+
+# ============================================================
+# 1. Helpers: timestamps and dialect-aware upsert
+# ============================================================
+
+# Margin between our clock and RAWG's "updated" timestamps
+CLOCK_SKEW = pd.Timedelta(minutes=5)
+
+
+def utc_now():
+    return pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+
+def parse_timestamp(value):
+    # RAWG "updated" is ISO without timezone; keep everything naive UTC
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts
+
+
+def upsert(conn, target, rows, key_cols, update_cols):
+    if not rows:
+        return
+
+    # --------------------------------------
+    # MySQL in production, SQLite for local runs
+    # --------------------------------------
+    if conn.dialect.name == "mysql":
+        stmt = mysql.insert(target).values(rows)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+    elif conn.dialect.name == "sqlite":
+        stmt = sqlite.insert(target).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_cols, set_={c: stmt.excluded[c] for c in update_cols}
+        )
+    else:
+        raise ValueError(f"Unsupported database dialect '{conn.dialect.name}'")
+
+    conn.execute(stmt)
+
+
+# ============================================================
+# 2. High-watermark of last_updated
+# ============================================================
+
+def read_watermark(conn, source=SYNC_SOURCE):
+    row = conn.execute(
+        select(SYNC_STATE.c.high_watermark).where(SYNC_STATE.c.source == source)
+    ).fetchone()
+    return parse_timestamp(row[0]) if row and row[0] else None
+
+
+def write_watermark(conn, watermark, source=SYNC_SOURCE):
+    upsert(
+        conn, SYNC_STATE,
+        [{"source": source, "high_watermark": watermark.strftime("%Y-%m-%dT%H:%M:%S")}],
+        key_cols=["source"], update_cols=["high_watermark"]
+    )
+
+
+def initial_watermark(conn, bootstrap=None, source=SYNC_SOURCE):
+    # --------------------------------------
+    # 1) sync_state  2) explicit bootstrap  3) MAX(games.last_updated)
+    # --------------------------------------
+    watermark = read_watermark(conn, source)
+    if watermark is not None:
+        return watermark
+    if bootstrap is not None:
+        return parse_timestamp(bootstrap)
+
+    latest, n_games = conn.execute(select(func.max(GAMES.c.last_updated), func.count())).fetchone()
+    if latest is not None:
+        return parse_timestamp(latest)
+
+    # --------------------------------------
+    # Games loaded without last_updated: never crawl the whole catalog by accident
+    # --------------------------------------
+    if n_games:
+        raise ValueError(
+            "games has rows but no last_updated and sync_state is empty: "
+            "pass bootstrap (or set RAWG_SYNC_BOOTSTRAP) for the first delta sync"
+        )
+    return None
+
+
+# ============================================================
+# 3. Generator over the games modified since the watermark
+# ============================================================
+
+def iter_updated_pages(watermark, base_url=RAWG_BASE_URL, api_key=RAWG_API_KEY,
+                       page_size=40, max_pages=None, session=None):
+    session = session or requests.Session()
+    url = f"{base_url}/games"
+
+    # --------------------------------------
+    # Oldest update first, so every committed page can move the watermark
+    # forward; the "updated" filter is per day, earlier games of the
+    # watermark day are skipped (games updated exactly at the watermark
+    # are fetched again, the upsert is idempotent)
+    # --------------------------------------
+    params = {"key": api_key, "page_size": page_size, "ordering": "updated"}
+    if watermark is not None:
+        params["updated"] = f"{watermark.date().isoformat()},{utc_now().date().isoformat()}"
+
+    page_count = 0
+
+    while url and (max_pages is None or page_count < max_pages):
+        page_count += 1
+        response = session.get(url, params=params, timeout=15)
+        response.raise_for_status()
+        data = response.json()
+
+        games = [
+            game for game in data.get("results", [])
+            if watermark is None or parse_timestamp(game.get("updated")) >= watermark
+        ]
+        if games:
+            yield games
+
+        # ------------------------------
+        # "next" already carries the query string
+        # ------------------------------
+        url = data.get("next")
+        params = None
+
+
+def fetch_game_details(game_id, base_url=RAWG_BASE_URL, api_key=RAWG_API_KEY, session=None, max_retries=3):
+    session = session or requests.Session()
+
+    for attempt in range(max_retries):
+        try:
+            response = session.get(f"{base_url}/games/{game_id}", params={"key": api_key}, timeout=15)
+            response.raise_for_status()
+            data = response.json()
+            return data if isinstance(data, dict) else None
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.HTTPError):
+            if attempt < max_retries - 1:
+                time.sleep(2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
+
+    return None
+
+
+# ============================================================
+# 4. Cleaning + merge of a batch (same steps as the notebook)
+# ============================================================
+
+def clean_games_list(games):
+    df = pd.DataFrame(games)
+
+    df = df.rename(
+        columns={"id": "rawg_id",
+                 "name": "game_name",
+                 "released": "release_date",
+                 "tba": "to_be_announced",
+                 "rating": "user_rating",
+                 "rating_top": "max_user_note",
+                 "metacritic": "metacritic_score",
+                 "playtime": "avg_playtime_hours",
+                 "updated": "last_updated",
+                 })
+
+    df = df.drop(
+        columns=["slug",
+                 "background_image",
+                 "saturated_color",
+                 "dominant_color",
+                 "short_screenshots",
+                 "parent_platforms",
+                 "clip",
+                 "user_game",
+                 "community_rating"],
+        errors="ignore"
+    )
+
+    df = df.dropna(subset=["release_date"]).copy()
+    if df.empty:
+        return df
+
+    df["release_date"] = pd.to_datetime(df["release_date"], errors="coerce").dt.strftime("%d-%m-%Y")
+    df["last_updated"] = pd.to_datetime(df["last_updated"], errors="coerce").dt.strftime("%d-%m-%Y %H:%M:%S")
+
+    df = cf.clean_ratings_column(df, ratings_col="ratings")
+    df = cf.expand_added_by_status(df, col="added_by_status")
+    df = cf.clean_platforms_column(df, col="platforms")
+    df = cf.clean_genres_column(df, col="genres")
+    df = cf.clean_stores(df, col="stores")
+    df = cf.clean_tags_column(df, tags_col="tags")
+    df = cf.clean_esrb_column(df, col="esrb_rating")
+
+    df = df.dropna(subset=["store_list"])
+
+    return df
+
+
+def extract_detail_fields(details):
+    esrb_rating = details.get("esrb_rating")
+
+    def names(items):
+        return ", ".join(i["name"] for i in items or [] if isinstance(i, dict) and "name" in i)
+
+    return {
+        "rawg_id": details.get("id"),
+        "game_name": details.get("name"),
+        "release_date": details.get("released"),
+        "metacritic_score": details.get("metacritic"),
+        "user_rating": details.get("rating"),
+        "ratings_count": details.get("ratings_count"),
+        "avg_playtime_hours": details.get("playtime"),
+        "genres_list": names(details.get("genres")),
+        "platforms_list": ", ".join(
+            p["platform"]["name"] for p in details.get("platforms") or []
+            if isinstance(p, dict) and isinstance(p.get("platform"), dict) and "name" in p["platform"]
+        ),
+        "developers": names(details.get("developers")),
+        "publishers": names(details.get("publishers")),
+        "tags_list": names(details.get("tags")),
+        "suggestions_count": details.get("suggestions_count"),
+        "esrb_rating_list": esrb_rating.get("name") if isinstance(esrb_rating, dict) else None,
+    }
+
+
+def prepare_batch(games, fetch_details=True, **api_kwargs):
+    df_list = clean_games_list(games)
+    if df_list.empty:
+        return df_list
+
+    # --------------------------------------
+    # Details only for the changed games
+    # --------------------------------------
+    records = []
+    if fetch_details:
+        for game_id in df_list["rawg_id"]:
+            details = fetch_game_details(game_id, **api_kwargs)
+            if details is not None:
+                records.append(extract_detail_fields(details))
+
+    df_details = pd.DataFrame(records, columns=["rawg_id"] if not records else None)
+    if "release_date" in df_details.columns:
+        df_details["release_date"] = pd.to_datetime(df_details["release_date"], errors="coerce").dt.strftime("%d-%m-%Y")
+
+    return mf.merge_games_data(df_list, df_details)
+
+
+# ============================================================
+# 5. Upsert of one batch (games + dimensions + bridges)
+# ============================================================
+
+def none_if_nan(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value
+
+
+def upsert_batch(conn, df):
+    if df.empty:
+        return 0
+
+    # --------------------------------------
+    # games (rawg_id is UNIQUE)
+    # --------------------------------------
+    release = pd.to_datetime(df["release_date"], format="%d-%m-%Y", errors="coerce")
+    updated = pd.to_datetime(df["last_updated"], format="%d-%m-%Y %H:%M:%S", errors="coerce")
+
+    rows = []
+    for i, (_, r) in enumerate(df.iterrows()):
+        rows.append({
+            "rawg_id": int(r["rawg_id"]),
+            "game_name": none_if_nan(r.get("game_name")),
+            "release_date": release.iloc[i].date() if pd.notna(release.iloc[i]) else None,
+            "user_rating": none_if_nan(r.get("user_rating")),
+            "ratings_count": none_if_nan(r.get("ratings_count")),
+            "avg_playtime_hours": none_if_nan(r.get("avg_playtime_hours")),
+            "last_updated": updated.iloc[i].to_pydatetime() if pd.notna(updated.iloc[i]) else None,
+        })
+    upsert(conn, GAMES, rows, key_cols=["rawg_id"], update_cols=[c for c in rows[0] if c != "rawg_id"])
+
+    rawg_ids = [row["rawg_id"] for row in rows]
+    game_ids = dict(conn.execute(
+        select(GAMES.c.rawg_id, GAMES.c.game_id).where(GAMES.c.rawg_id.in_(rawg_ids))
+    ).fetchall())
+
+    # --------------------------------------
+    # Dimensions + bridges: replace the links of each changed game
+    # --------------------------------------
+    for dim_table, id_col, name_col, bridge_table, list_col in DIMENSIONS.values():
+        dim = table(dim_table, column(id_col), column(name_col))
+        bridge = table(bridge_table, column("game_id"), column(id_col))
+
+        links = []
+        for rawg_id, value in zip(df["rawg_id"], df[list_col]):
+            if isinstance(value, str):
+                for name in {v.strip() for v in value.split(",") if v.strip()}:
+                    links.append((game_ids[int(rawg_id)], name))
+
+        names = sorted({name for _, name in links})
+        upsert(conn, dim, [{name_col: n} for n in names], key_cols=[name_col], update_cols=[name_col])
+        name_ids = dict(conn.execute(
+            select(dim.c[name_col], dim.c[id_col]).where(dim.c[name_col].in_(names))
+        ).fetchall()) if names else {}
+
+        conn.execute(delete(bridge).where(bridge.c.game_id.in_(list(game_ids.values()))))
+        if links:
+            conn.execute(insert(bridge), [{"game_id": g, id_col: name_ids[n]} for g, n in links])
+
+    return len(rows)
+
+
+# ============================================================
+# 6. Delta sync: fetch -> clean/merge -> upsert, batch by batch
+# ============================================================
+
+def sync_batch(engine, games, watermark, fetch_details=True, on_batch=None, **api_kwargs):
+    df_batch = prepare_batch(games, fetch_details=fetch_details, **api_kwargs)
+
+    # --------------------------------------
+    # One transaction per batch, watermark included:
+    # a failed batch is retried from the same point next run
+    # --------------------------------------
+    batch_watermark = max(parse_timestamp(g["updated"]) for g in games)
+    if watermark is not None:
+        batch_watermark = max(batch_watermark, watermark)
+
+    with engine.begin() as conn:
+        upserted = upsert_batch(conn, df_batch)
+        write_watermark(conn, batch_watermark)
+
+        # ----------------------------------
+        # New *and* modified games to the callback (e.g.
+        # cube_functions.refresh_cube_file) before the commit:
+        # if it raises, the batch rolls back and is replayed next run
+        # (the cube refresh swaps by rawg_id, replaying it is harmless)
+        # ----------------------------------
+        if on_batch is not None and not df_batch.empty:
+            on_batch(df_batch)
+
+    return df_batch, upserted, batch_watermark
+
+
+def run_delta_sync(engine, batch_size=200, fetch_details=True, on_batch=None, bootstrap=SYNC_BOOTSTRAP,
+                   base_url=RAWG_BASE_URL, api_key=RAWG_API_KEY, page_size=40, max_pages=None, max_passes=3):
+    with engine.connect() as conn:
+        watermark = initial_watermark(conn, bootstrap)
+
+    session = requests.Session()
+    api_kwargs = {"base_url": base_url, "api_key": api_key, "session": session}
+
+    summary = {"previous_watermark": watermark, "watermark": watermark, "fetched": 0,
+               "upserted": 0, "batches": 0, "passes": 0}
+
+    # --------------------------------------
+    # Upsert as pages arrive: memory stays flat and a crash keeps
+    # everything committed so far
+    # --------------------------------------
+    def flush(games):
+        df_batch, upserted, summary["watermark"] = sync_batch(
+            engine, games, summary["watermark"], fetch_details=fetch_details, on_batch=on_batch, **api_kwargs
+        )
+        summary["upserted"] += upserted
+        summary["batches"] += 1
+
+    seen = {}  # rawg id -> "updated" already upserted during this run
+    pass_start = watermark
+
+    for _ in range(max_passes):
+        summary["passes"] += 1
+        crawl_started = utc_now() - CLOCK_SKEW
+        boundaries = []  # (fetched at, last "updated" of the page)
+        moved = []
+
+        pending = {}
+        for page in iter_updated_pages(pass_start, base_url=base_url, api_key=api_key,
+                                       page_size=page_size, max_pages=max_pages, session=session):
+            summary["fetched"] += len(page)
+            boundaries.append((utc_now(), parse_timestamp(page[-1]["updated"])))
+
+            for game in page:
+                if seen.get(game["id"]) == game["updated"]:
+                    continue  # already upserted by an earlier pass
+                updated = parse_timestamp(game["updated"])
+                if updated >= crawl_started:
+                    moved.append(updated)
+                seen[game["id"]] = game["updated"]
+                pending.pop(game["id"], None)  # keep the latest version, in update order
+                pending[game["id"]] = game
+
+            if len(pending) >= batch_size:
+                flush(list(pending.values()))
+                pending = {}
+
+        if pending:
+            flush(list(pending.values()))
+
+        # ----------------------------------
+        # "next" is offset pagination over ordering=updated: a game updated
+        # while we crawl jumps to the end and every later game shifts one
+        # slot earlier, so one game per later page boundary is skipped.
+        # Re-scan from the last page read before the first such update.
+        # ----------------------------------
+        if not moved:
+            break
+        first_move = min(moved) - CLOCK_SKEW
+        earlier = [last for fetched_at, last in boundaries if fetched_at < first_move]
+        if earlier:
+            pass_start = earlier[-1]
+
+    return summary
+
+
+# ==============================================================
+# Main (hourly job, e.g. cron: 0 * * * * python sync_functions.py)
+# The API cube (market_cube.pkl) follows every committed batch
+# ==============================================================
+
+if __name__ == "__main__":
+    print(run_delta_sync(create_engine(DATABASE_URL), on_batch=cbf.refresh_cube_file))
@@ -0,0 +1,253 @@
+# ==================
+# library imports
+# ==================
+
+import re
+from collections import deque
+
+import pandas as pd
+import numpy as np
+
+
+# ============================================================
+# Tokenizer shared by keywords and tags
+# ============================================================
+# "Co-op", "co op" and "CO OP" all become ("co", "op"), so a keyword
+# only matches whole tokens and never inside another word ("lan" in "Plan")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+ITEM_SEPARATOR = ","
+ROW_MARKER = "\x1e"  # ASCII record separator, never present in RAWG lists
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+# ============================================================
+# 1. Function to compile a keyword taxonomy into one automaton
+# ============================================================
+
+def build_keyword_automaton(taxonomy):
+    # --------------------------------------
+    # taxonomy = {label: [keyword, ...], ...}
+    # Aho-Corasick over tokens (not characters)
+    # --------------------------------------
+    goto = [{}]
+    out = [set()]
+
+    for label, keywords in taxonomy.items():
+        for keyword in keywords:
+            tokens = tokenize(keyword)
+            if not tokens:
+                continue
+
+            state = 0
+            for tok in tokens:
+                if tok not in goto[state]:
+                    goto.append({})
+                    out.append(set())
+                    goto[state][tok] = len(goto) - 1
+                state = goto[state][tok]
+            out[state].add(label)
+
+    # --------------------------------------
+    # Failure links (breadth-first)
+    # --------------------------------------
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+
+    while queue:
+        state = queue.popleft()
+        for tok, nxt in goto[state].items():
+            queue.append(nxt)
+            f = fail[state]
+            while f and tok not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(tok, 0)
+            out[nxt] |= out[fail[nxt]]
+
+    return {
+        "labels": list(taxonomy.keys()),
+        "goto": goto,
+        "fail": fail,
+        "out": [frozenset(o) for o in out],
+    }
+
+
+# ============================================================
+# 2. Function to find every label present in one text
+# ============================================================
+
+def match_labels(automaton, text, sep=ITEM_SEPARATOR):
+    goto = automaton["goto"]
+    fail = automaton["fail"]
+    out = automaton["out"]
+
+    found = set()
+
+    # --------------------------------------
+    # Restart at each item: a keyword never spans two tags
+    # --------------------------------------
+    for item in (text.split(sep) if sep else [text]):
+        state = 0
+        for tok in tokenize(item):
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            if out[state]:
+                found |= out[state]
+
+    return found
+
+
+# ============================================================
+# 3. Function to create a flag dataframe from a taxonomy
+# ============================================================
+
+def create_taxonomy_flags(df, col, automaton, id_col="rawg_id", name_col="game_name", prefix="is_"):
+    labels = automaton["labels"]
+    if len(labels) > 64:
+        raise ValueError("create_taxonomy_flags supports at most 64 labels per automaton")
+
+    # --------------------------------------
+    # One flat list of items (tags) for the whole column, each row
+    # preceded by a marker: whole rows are almost all distinct,
+    # individual tags are only a few thousand
+    # --------------------------------------
+    values = df[col].fillna("").astype(str).tolist()
+    marker_sep = ITEM_SEPARATOR + ROW_MARKER + ITEM_SEPARATOR
+    items = (ROW_MARKER + ITEM_SEPARATOR + marker_sep.join(values)).split(ITEM_SEPARATOR)
+    codes, uniques = pd.factorize(np.array(items, dtype=object))
+
+    # --------------------------------------
+    # Automaton run once per distinct item -> bitmask of labels
+    # --------------------------------------
+    position = {label: i for i, label in enumerate(labels)}
+    unique_masks = np.zeros(len(uniques), dtype=np.uint64)
+    for i, value in enumerate(uniques):
+        if value == ROW_MARKER:
+            continue
+        for label in match_labels(automaton, value, sep=None):
+            unique_masks[i] |= np.uint64(1) << np.uint64(position[label])
+
+    # --------------------------------------
+    # Back to rows: OR of the item masks between two markers
+    # --------------------------------------
+    out = df[[id_col, name_col]].copy()
+    if len(df) == 0:
+        for label in labels:
+            out[prefix + label] = np.zeros(0, dtype=np.int64)
+        return out
+
+    marker_code = int(np.flatnonzero(uniques == ROW_MARKER)[0])
+    row_starts = np.flatnonzero(codes == marker_code)
+    row_masks = np.bitwise_or.reduceat(unique_masks[codes], row_starts)
+
+    # --------------------------------------
+    # New dataframe, input left untouched
+    # --------------------------------------
+    for label in labels:
+        bit = np.uint64(position[label])
+        out[prefix + label] = ((row_masks >> bit) & np.uint64(1)).astype(np.int64)
+
+    return out
+
+
+# ============================================================
+# 4. Benchmark against the previous regex approach
+# ============================================================
+
+def benchmark(n_rows=1_000_000, seed=42):
+    import time
+    import addtional_flags_functions as af
+
+    # --------------------------------------
+    # Tag vocabulary with the expected multiplayer answer, so a changed
+    # flag can be classified as a fix or as a regression
+    # --------------------------------------
+    tag_truth = {
+        "Singleplayer": 0, "Multiplayer": 1, "Online Co-Op": 1, "Atmospheric": 0,
+        "Steam Achievements": 0, "Full controller support": 0, "Planetary": 0, "Exploration": 0,
+        "FPS": 1, "Balanced": 0, "Local Co-Op": 1, "PvP": 1, "2D": 0, "Open World": 0,
+        "Island": 0, "MMORPG": 1, "MMO": 1, "Classic": 0, "Battle Royale": 1, "Cooperative": 1,
+        "Story Rich": 0, "Atlantis": 0, "Online PvP": 1, "Massively Multiplayer": 1,
+    }
+    platform_names = [
+        "PC", "PlayStation 4", "PlayStation 5", "Xbox One", "Xbox Series S/X", "Nintendo Switch",
+        "Wii U", "Nintendo 3DS", "iOS", "Android", "macOS", "Linux", "GameCube",
+    ]
+
+    rng = np.random.default_rng(seed)
+
+    def random_lists(vocabulary, max_size):
+        sizes = rng.integers(1, max_size, n_rows)
+        picks = rng.integers(0, len(vocabulary), sizes.sum())
+        bounds = np.concatenate([[0], np.cumsum(sizes)])
+        rows = [[vocabulary[j] for j in picks[bounds[i]:bounds[i + 1]]] for i in range(n_rows)]
+        return rows
+
+    vocabulary = list(tag_truth)
+    tag_rows = random_lists(vocabulary, 12)
+    truth = np.array([max(tag_truth[t] for t in row) for row in tag_rows])
+
+    df = pd.DataFrame({
+        "rawg_id": np.arange(n_rows),
+        "game_name": "x",
+        "tags_list": [", ".join(row) for row in tag_rows],
+        "platforms_list": [", ".join(row) for row in random_lists(platform_names, 6)],
+    })
+
+    results = {"n_rows": n_rows}
+
+    # --------------------------------------
+    # Multiplayer: previous substring regex vs automaton
+    # --------------------------------------
+    old_keywords = [
+        "multiplayer", "online", "co-op", "co op", "coop", "fps", "cooperative",
+        "mmo", "pvp", "pve", "crossplay", "lan", "battle-royale", "battle royale",
+        "survival-multiplayer"
+    ]
+    start = time.perf_counter()
+    pattern = r"|".join([re.escape(k.lower()) for k in old_keywords])
+    regex_flags = df["tags_list"].astype(str).str.lower().str.contains(pattern, regex=True).astype(int).to_numpy()
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ac_flags = create_taxonomy_flags(df, "tags_list", af.MULTIPLAYER_AUTOMATON)["is_multiplayer"].to_numpy()
+    ac_time = time.perf_counter() - start
+
+    results.update({
+        "multiplayer_regex_seconds": round(regex_time, 3),
+        "multiplayer_automaton_seconds": round(ac_time, 3),
+        "multiplayer_speedup": round(regex_time / ac_time, 2),
+        # regex wrong, automaton right (e.g. "lan" in "Planetary")
+        "rows_fixed": int(((regex_flags != truth) & (ac_flags == truth)).sum()),
+        # regex right, automaton wrong
+        "rows_regressed": int(((regex_flags == truth) & (ac_flags != truth)).sum()),
+    })
+
+    # --------------------------------------
+    # Platforms: five regex scans vs one automaton pass
+    # --------------------------------------
+    start = time.perf_counter()
+    pls = df["platforms_list"].astype(str)
+    for regex in [r"\bPC\b", r"PlayStation", r"Xbox", r"Switch|Wii|GameCube|Nintendo|3DS", r"iOS|Android"]:
+        pls.str.contains(regex, case=False, regex=True)
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    create_taxonomy_flags(df, "platforms_list", af.PLATFORM_AUTOMATON)
+    ac_time = time.perf_counter() - start
+
+    results.update({
+        "platform_regex_seconds": round(regex_time, 3),
+        "platform_automaton_seconds": round(ac_time, 3),
+        "platform_speedup": round(regex_time / ac_time, 2),
+    })
+
+    return results
+
+
+if __name__ == "__main__":
+    print(benchmark())
@@ -0,0 +1,253 @@
+import os
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import scraping_functions as sf
+
+
+FIXTURE_HTML = os.path.join(os.path.dirname(__file__), "fixtures", "steam_app.html")
+ETAG = '"portal2-v1"'
+
+
+# ============================================================
+# Local store server serving a saved Steam page
+# ============================================================
+
+class StoreHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        path = self.path.split("?")[0]
+
+        with state["lock"]:
+            state["hits"][path] = state["hits"].get(path, 0) + 1
+            state["conditional"].append(self.headers.get("If-None-Match"))
+            hits = state["hits"][path]
+
+        if path == "/app/620/Portal_2/":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send_body(304)
+            else:
+                self.send_body(200, state["html"], {"ETag": ETAG})
+
+        elif path == "/app/1/flaky/":
+            # Two server errors, then the page
+            if hits <= 2:
+                self.send_body(503)
+            else:
+                self.send_body(200, state["html"])
+
+        elif path == "/app/2/switch/":
+            status = state["switch_status"]
+            if status == 200:
+                self.send_body(200, state["html"], {"ETag": ETAG})
+            else:
+                self.send_body(status)
+
+        elif path == "/app/3/slow/":
+            with state["lock"]:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                state["starts"].append(time.monotonic())
+            time.sleep(0.1)
+            with state["lock"]:
+                state["in_flight"] -= 1
+            self.send_body(200, state["html"])
+
+        elif path == "/loop":
+            self.send_body(302, headers={"Location": "/loop"})
+
+        else:
+            self.send_body(404)
+
+
+@pytest.fixture
+def store():
+    with open(FIXTURE_HTML, "rb") as f:
+        html = f.read()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StoreHandler)
+    server.daemon_threads = True
+    server.state = {
+        "lock": threading.Lock(),
+        "html": html,
+        "hits": {},
+        "conditional": [],
+        "switch_status": 200,
+        "in_flight": 0,
+        "max_in_flight": 0,
+        "starts": [],
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def fast_limiter():
+    return sf.HostLimiter(max_per_host=4, min_delay=0)
+
+
+# ============================================================
+# Parsing
+# ============================================================
+
+def test_parse_store_page_fields():
+    with open(FIXTURE_HTML, "r", encoding="utf-8") as f:
+        record = sf.parse_store_page(f.read(), "https://store.steampowered.com/app/620/Portal_2/")
+
+    assert record["app_id"] == 620
+    assert record["game_name"] == "Portal 2"
+    assert record["release_date"] == "18 Apr, 2011"
+    assert record["price"] == "1,95€"
+    assert record["review_summary"] == "Overwhelmingly Positive"
+    assert record["review_count"] == 412345
+    assert record["developers"] == ["Valve"]
+    assert record["publishers"] == ["Valve", "Electronic Arts"]
+    assert record["tags"] == ["Puzzle", "Co-op", "First-Person"]
+
+
+def test_scrape_store_pages_parses_served_page(store, tmp_path):
+    url = store.base_url + "/app/620/Portal_2/"
+    records = list(sf.scrape_store_pages([url], min_delay=0, cache_dir=str(tmp_path)))
+
+    assert len(records) == 1
+    assert records[0]["game_name"] == "Portal 2"
+    assert records[0]["app_id"] == 620
+    assert records[0]["from_cache"] is False
+
+
+# ============================================================
+# Cache: ETag revalidation and rerun
+# ============================================================
+
+def test_etag_revalidation_returns_cached_body(store, tmp_path):
+    url = store.base_url + "/app/620/Portal_2/"
+    cache_dir = str(tmp_path)
+
+    html, from_cache, error = sf.fetch_page(url, fast_limiter(), cache_dir=cache_dir)
+    assert from_cache is False and error is None
+    assert store.state["conditional"] == [None]
+
+    html_again, from_cache, error = sf.fetch_page(url, fast_limiter(), cache_dir=cache_dir)
+    assert from_cache is True and error is None
+    assert html_again == html
+    # Second request was conditional and answered 304
+    assert store.state["conditional"] == [None, ETAG]
+
+
+def test_rerun_hits_cache(store, tmp_path):
+    urls = [store.base_url + "/app/620/Portal_2/"]
+    cache_dir = str(tmp_path)
+
+    first = list(sf.scrape_store_pages(urls, min_delay=0, cache_dir=cache_dir))
+    second = list(sf.scrape_store_pages(urls, min_delay=0, cache_dir=cache_dir))
+
+    assert first[0]["from_cache"] is False
+    assert second[0]["from_cache"] is True
+    assert {k: v for k, v in second[0].items() if k != "from_cache"} == \
+        {k: v for k, v in first[0].items() if k != "from_cache"}
+
+
+# ============================================================
+# Retries and stale copies
+# ============================================================
+
+def test_retry_on_5xx(store):
+    url = store.base_url + "/app/1/flaky/"
+    html, from_cache, error = sf.fetch_page(url, fast_limiter(), cache_dir=None, max_retries=3, backoff=0)
+
+    assert html is not None and error is None
+    assert store.state["hits"]["/app/1/flaky/"] == 3
+
+
+def test_no_retry_on_404(store):
+    url = store.base_url + "/app/999/missing/"
+    html, from_cache, error = sf.fetch_page(url, fast_limiter(), cache_dir=None, max_retries=3, backoff=0)
+
+    assert html is None and error == "http_404"
+    assert store.state["hits"]["/app/999/missing/"] == 1
+
+
+def test_stale_copy_after_5xx_but_not_after_404(store, tmp_path):
+    url = store.base_url + "/app/2/switch/"
+    cache_dir = str(tmp_path)
+    sf.fetch_page(url, fast_limiter(), cache_dir=cache_dir)
+
+    store.state["switch_status"] = 503
+    html, from_cache, error = sf.fetch_page(url, fast_limiter(), cache_dir=cache_dir, backoff=0)
+    assert html is not None and from_cache is True
+
+    store.state["switch_status"] = 404
+    html, from_cache, error = sf.fetch_page(url, fast_limiter(), cache_dir=cache_dir, backoff=0)
+    assert html is None and error == "http_404"
+
+
+def test_request_exception_becomes_error_record(store):
+    urls = [store.base_url + "/loop", store.base_url + "/app/620/Portal_2/"]
+    records = {r["url"]: r for r in sf.scrape_store_pages(urls, min_delay=0, cache_dir=None, backoff=0)}
+
+    assert records[urls[0]]["error"] == "request_error: TooManyRedirects"
+    assert records[urls[1]]["game_name"] == "Portal 2"
+
+
+def test_parse_failure_becomes_error_record(store, monkeypatch):
+    def broken_parser(html, url=None):
+        raise ValueError("unexpected layout")
+
+    monkeypatch.setattr(sf, "parse_store_page", broken_parser)
+    url = store.base_url + "/app/620/Portal_2/"
+    records = list(sf.scrape_store_pages([url], min_delay=0, cache_dir=None))
+
+    assert records == [{"url": url, "error": "parse_failed: ValueError: unexpected layout"}]
+
+
+# ============================================================
+# Per-host politeness
+# ============================================================
+
+def test_max_per_host(store):
+    urls = [f"{store.base_url}/app/3/slow/?page={i}" for i in range(8)]
+    records = list(sf.scrape_store_pages(urls, max_workers=8, max_per_host=2, min_delay=0, cache_dir=None))
+
+    assert len(records) == 8
+    assert all("error" not in r for r in records)
+    assert store.state["max_in_flight"] == 2
+
+
+def test_min_delay_between_requests(store):
+    urls = [f"{store.base_url}/app/3/slow/?page={i}" for i in range(4)]
+    list(sf.scrape_store_pages(urls, max_workers=4, max_per_host=4, min_delay=0.15, cache_dir=None))
+
+    starts = sorted(store.state["starts"])
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 4
+    assert min(gaps) >= 0.12
+
+
+def test_duplicate_urls_fetched_concurrently(store, tmp_path):
+    url = store.base_url + "/app/3/slow/"
+    records = list(sf.scrape_store_pages([url] * 6, max_workers=6, max_per_host=6, min_delay=0,
+                                         cache_dir=str(tmp_path)))
+
+    assert len(records) == 6
+    assert all("error" not in r for r in records)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
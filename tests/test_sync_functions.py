@@ -0,0 +1,248 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+import sync_functions as sf
+
+
+# ============================================================
+# Local stand-in for the RAWG /games endpoint
+# ============================================================
+
+def make_game(rawg_id, updated, platforms=("PC",), rating=4.0):
+    return {
+        "id": rawg_id,
+        "name": f"Game {rawg_id}",
+        "released": "2020-05-01",
+        "rating": rating,
+        "ratings": [],
+        "ratings_count": 5,
+        "added_by_status": {},
+        "playtime": 3,
+        "metacritic": None,
+        "updated": updated,
+        "platforms": [{"platform": {"name": p}} for p in platforms],
+        "genres": [{"name": "RPG"}],
+        "stores": [{"store": {"name": "Steam"}}],
+        "tags": [{"name": "Indie"}],
+        "esrb_rating": {"name": "Teen"},
+    }
+
+
+class RawgHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        state = self.server.state
+        query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        page = int(query.get("page", 1))
+        page_size = int(query.get("page_size", 40))
+
+        # Hook: simulate a game updated on RAWG while the crawl runs
+        hook = state["on_page"].pop(page, None)
+        if hook:
+            hook(state["games"])
+
+        # ordering=updated + per-day "updated" filter, offset pagination
+        games = sorted(state["games"].values(), key=lambda g: (g["updated"], g["id"]))
+        if "updated" in query:
+            low, high = query["updated"].split(",")
+            games = [g for g in games if low <= g["updated"][:10] <= high]
+
+        results = games[(page - 1) * page_size:page * page_size]
+        has_next = page * page_size < len(games)
+        next_url = f"{self.server.base_url}/games?{urlencode({**query, 'page': page + 1})}" if has_next else None
+
+        state["requests"] += 1
+        body = json.dumps({"count": len(games), "next": next_url, "results": results}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def rawg():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RawgHandler)
+    server.daemon_threads = True
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.state = {"games": {}, "on_page": {}, "requests": 0}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+# ============================================================
+# Local database (SQLite version of Table_Creation.sql)
+# ============================================================
+
+SCHEMA = [
+    """CREATE TABLE games (
+        game_id INTEGER PRIMARY KEY AUTOINCREMENT, rawg_id INT NOT NULL UNIQUE, game_name TEXT,
+        release_date DATE, user_rating FLOAT, ratings_count INT, avg_playtime_hours FLOAT, last_updated DATETIME
+    )""",
+    "CREATE TABLE platforms (platform_id INTEGER PRIMARY KEY AUTOINCREMENT, platform_name TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE genres (genre_id INTEGER PRIMARY KEY AUTOINCREMENT, genre_name TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE stores (store_id INTEGER PRIMARY KEY AUTOINCREMENT, store_name TEXT NOT NULL UNIQUE)",
+    "CREATE TABLE game_platforms (game_id INT, platform_id INT)",
+    "CREATE TABLE game_genres (game_id INT, genre_id INT)",
+    "CREATE TABLE game_stores (game_id INT, store_id INT)",
+    "CREATE TABLE sync_state (source TEXT PRIMARY KEY, high_watermark TEXT)",
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'video_game_market.db'}")
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.exec_driver_sql(statement)
+    yield engine
+    engine.dispose()
+
+
+def query(engine, sql):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(sql).fetchall()
+
+
+def sync(engine, rawg, **kwargs):
+    kwargs.setdefault("bootstrap", "2026-01-01T00:00:00")
+    return sf.run_delta_sync(engine, fetch_details=False, base_url=rawg.base_url, api_key="test", **kwargs)
+
+
+# ============================================================
+# Watermark bootstrap
+# ============================================================
+
+def test_bootstrap_guard_on_games_without_last_updated(engine, rawg):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO games (rawg_id, game_name) VALUES (99, 'Loaded by Filling_Tables.sql')")
+
+    with pytest.raises(ValueError, match="bootstrap"):
+        sync(engine, rawg, bootstrap=None)
+    assert rawg.state["requests"] == 0
+
+    with engine.connect() as conn:
+        assert sf.initial_watermark(conn, "2026-01-05T00:00:00") == pd.Timestamp("2026-01-05")
+
+
+def test_watermark_seeded_from_max_last_updated(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO games (rawg_id, last_updated) VALUES (1, '2026-01-03 08:00:00'), (2, '2026-01-09 12:30:00')"
+        )
+    with engine.connect() as conn:
+        assert sf.initial_watermark(conn) == pd.Timestamp("2026-01-09 12:30:00")
+
+
+def test_empty_database_starts_from_scratch(engine):
+    with engine.connect() as conn:
+        assert sf.initial_watermark(conn) is None
+
+
+# ============================================================
+# Multi-page run
+# ============================================================
+
+def test_watermark_after_multi_page_run(engine, rawg):
+    for i in range(1, 8):
+        rawg.state["games"][i] = make_game(i, f"2026-01-{i + 1:02d}T10:00:00")
+
+    summary = sync(engine, rawg, page_size=2, batch_size=3)
+
+    assert rawg.state["requests"] == 4
+    assert summary["fetched"] == 7 and summary["upserted"] == 7 and summary["passes"] == 1
+    assert summary["watermark"] == pd.Timestamp("2026-01-08T10:00:00")
+    assert query(engine, "SELECT source, high_watermark FROM sync_state") == [("rawg_games", "2026-01-08T10:00:00")]
+    assert query(engine, "SELECT COUNT(*) FROM games") == [(7,)]
+
+    # Next run only sees the games of the watermark day again
+    rawg.state["requests"] = 0
+    summary = sf.run_delta_sync(engine, fetch_details=False, base_url=rawg.base_url, api_key="test", page_size=2)
+    assert summary["fetched"] == 1
+    assert summary["watermark"] == pd.Timestamp("2026-01-08T10:00:00")
+
+
+# ============================================================
+# Upsert: idempotent, bridges replaced
+# ============================================================
+
+def test_upsert_is_idempotent_and_replaces_bridges(engine, rawg):
+    rawg.state["games"][1] = make_game(1, "2026-01-02T10:00:00", platforms=("PC", "Xbox One"))
+    rawg.state["games"][2] = make_game(2, "2026-01-03T10:00:00")
+
+    sync(engine, rawg)
+    sync(engine, rawg)  # same feed again
+
+    assert query(engine, "SELECT COUNT(*) FROM games") == [(2,)]
+    assert query(engine, "SELECT COUNT(*) FROM game_platforms") == [(3,)]
+
+    # Game 1 leaves Xbox One for Nintendo Switch
+    rawg.state["games"][1] = make_game(1, "2026-01-04T10:00:00", platforms=("PC", "Nintendo Switch"), rating=3.5)
+    sync(engine, rawg)
+
+    platforms = query(engine, """
+        SELECT p.platform_name FROM game_platforms gp
+        JOIN games g ON g.game_id = gp.game_id
+        JOIN platforms p ON p.platform_id = gp.platform_id
+        WHERE g.rawg_id = 1 ORDER BY p.platform_name
+    """)
+    assert [p for (p,) in platforms] == ["Nintendo Switch", "PC"]
+    assert query(engine, "SELECT COUNT(*) FROM games") == [(2,)]
+    assert query(engine, "SELECT user_rating FROM games WHERE rawg_id = 1") == [(3.5,)]
+
+
+# ============================================================
+# Games updated during the crawl
+# ============================================================
+
+def test_re_updated_game_upserted_once_and_skipped_game_rescanned(engine, rawg):
+    for i in range(1, 7):
+        rawg.state["games"][i] = make_game(i, f"2026-01-{i + 1:02d}T10:00:00")
+
+    # Game 1 is updated on RAWG between page 1 and page 2: it jumps to the
+    # end and game 3 slides onto page 1, which was already read
+    def update_game_1(games):
+        now = sf.utc_now().strftime("%Y-%m-%dT%H:%M:%S")
+        games[1] = make_game(1, now, rating=1.0)
+
+    rawg.state["on_page"][2] = update_game_1
+
+    batches = []
+    summary = sync(engine, rawg, page_size=2, batch_size=100,
+                   on_batch=lambda df: batches.append(df["rawg_id"].tolist()))
+
+    upserted_ids = [rawg_id for batch in batches for rawg_id in batch]
+    assert sorted(upserted_ids) == [1, 2, 3, 4, 5, 6]  # every game once, game 3 via the re-scan
+    assert summary["passes"] == 2
+    assert query(engine, "SELECT user_rating FROM games WHERE rawg_id = 1") == [(1.0,)]
+    assert query(engine, "SELECT COUNT(*) FROM games") == [(6,)]
+
+
+# ============================================================
+# on_batch failure rolls the batch back
+# ============================================================
+
+def test_failed_on_batch_does_not_advance_watermark(engine, rawg):
+    rawg.state["games"][1] = make_game(1, "2026-01-02T10:00:00")
+
+    def failing_refresh(df):
+        raise FileNotFoundError("market_cube.pkl")
+
+    with pytest.raises(FileNotFoundError):
+        sync(engine, rawg, on_batch=failing_refresh)
+
+    assert query(engine, "SELECT COUNT(*) FROM sync_state") == [(0,)]
+    assert query(engine, "SELECT COUNT(*) FROM games") == [(0,)]
@@ -0,0 +1,331 @@
+# ==================
+# library imports
+# ==================
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import multiprocessing as mp
+
+import pandas as pd
+import numpy as np
+import joblib
+from threadpoolctl import threadpool_limits
+
+from sklearn.preprocessing import StandardScaler
+from sklearn.model_selection import train_test_split
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+
+# ============================================================
+# Model zoo (same hyperparameters as the notebook)
+# ============================================================
+
+REGRESSION_MODELS = ["rf", "gb", "lgbm", "catboost"]
+CLASSIFICATION_MODELS = ["logreg", "rf", "gb"]
+
+
+# ============================================================
+# 1. Function to build the scaled matrices once (shared memory)
+# ============================================================
+
+def prepare_shared_matrices(features, target, test_size, random_state=42,
+                            stratify=False, valid_size=0.1, folder=None):
+    # --------------------------------------
+    # Train / test split (as in the notebook)
+    # --------------------------------------
+    X_train, X_test, y_train, y_test = train_test_split(
+        features, target, test_size=test_size, random_state=random_state,
+        stratify=target if stratify else None
+    )
+
+    # --------------------------------------
+    # Scaling, fitted on train only
+    # --------------------------------------
+    # float32: every tree model casts to float32 internally anyway,
+    # so this avoids one private copy per model
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train).astype(np.float32)
+    X_test_scaled = scaler.transform(X_test).astype(np.float32)
+
+    # --------------------------------------
+    # Folder backed by RAM when available
+    # --------------------------------------
+    if folder is None:
+        base = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+        folder = tempfile.mkdtemp(prefix="vg_train_", dir=base)
+
+    # --------------------------------------
+    # Dump once, workers memory-map read-only
+    # --------------------------------------
+    arrays = {
+        "X_train": X_train_scaled,
+        "X_test": X_test_scaled,
+        "y_train": np.asarray(y_train),
+        "y_test": np.asarray(y_test),
+    }
+    paths = {}
+    for name, arr in arrays.items():
+        paths[name] = os.path.join(folder, name + ".mmap")
+        joblib.dump(np.ascontiguousarray(arr), paths[name])
+
+    # --------------------------------------
+    # Tail of the (already shuffled) train split = early stopping set
+    # --------------------------------------
+    n_valid = int(round(len(X_train_scaled) * valid_size))
+
+    return {
+        "folder": folder,
+        "paths": paths,
+        "n_fit": len(X_train_scaled) - n_valid,
+        "valid_size": valid_size,
+        "test_index": X_test.index,
+        "y_test": y_test,
+        "scaler": scaler,
+    }
+
+
+def release_shared_matrices(handle):
+    shutil.rmtree(handle["folder"], ignore_errors=True)
+
+
+# ============================================================
+# 2. Function to build one model with a CPU budget
+# ============================================================
+
+def build_model(task, name, n_threads, early_stopping_rounds, valid_size):
+    if task == "regression":
+        if name == "rf":
+            from sklearn.ensemble import RandomForestRegressor
+            return RandomForestRegressor(n_estimators=300, max_depth=None, random_state=42, n_jobs=n_threads)
+        if name == "gb":
+            from sklearn.ensemble import GradientBoostingRegressor
+            return GradientBoostingRegressor(
+                n_estimators=400, learning_rate=0.05, max_depth=4, random_state=42,
+                n_iter_no_change=early_stopping_rounds, validation_fraction=valid_size
+            )
+        if name == "lgbm":
+            from lightgbm import LGBMRegressor
+            return LGBMRegressor(n_estimators=500, learning_rate=0.05, num_leaves=31,
+                                 random_state=42, n_jobs=n_threads, verbose=-1)
+        if name == "catboost":
+            from catboost import CatBoostRegressor
+            return CatBoostRegressor(iterations=600, learning_rate=0.05, depth=6, loss_function="RMSE",
+                                     verbose=False, random_state=42, thread_count=n_threads)
+
+    if task == "classification":
+        if name == "logreg":
+            from sklearn.linear_model import LogisticRegression
+            return LogisticRegression(max_iter=500)
+        if name == "rf":
+            from sklearn.ensemble import RandomForestClassifier
+            return RandomForestClassifier(n_estimators=300, max_depth=None, min_samples_split=5,
+                                          random_state=42, n_jobs=n_threads)
+        if name == "gb":
+            from sklearn.ensemble import GradientBoostingClassifier
+            return GradientBoostingClassifier(
+                random_state=42, learning_rate=0.05, n_estimators=300,
+                n_iter_no_change=early_stopping_rounds, validation_fraction=valid_size
+            )
+
+    raise ValueError(f"Unknown model '{name}' for task '{task}'")
+
+
+# ============================================================
+# 3. Helper to read the peak resident memory of this process
+# ============================================================
+
+def peak_rss_mb():
+    if resource is None:
+        return np.nan
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 ** 2)
+    return peak / 1024
+
+
+# ============================================================
+# 4. Worker: fit + predict one model on the shared matrices
+# ============================================================
+
+def fit_one_model(task, name, handle, n_threads, early_stopping_rounds):
+    start = time.perf_counter()
+
+    # --------------------------------------
+    # Read-only memory maps: no private copy
+    # --------------------------------------
+    paths = handle["paths"]
+    X_train = joblib.load(paths["X_train"], mmap_mode="r")
+    y_train = joblib.load(paths["y_train"], mmap_mode="r")
+    X_test = joblib.load(paths["X_test"], mmap_mode="r")
+
+    model = build_model(task, name, n_threads, early_stopping_rounds, handle["valid_size"])
+
+    # --------------------------------------
+    # Fit, capping BLAS/OpenMP threads to the budget
+    # --------------------------------------
+    # --------------------------------------
+    # Early stopping is opt-in: without it every model
+    # sees the full train split, as in the notebook
+    # --------------------------------------
+    with threadpool_limits(limits=n_threads):
+        n_fit = handle["n_fit"]
+        if early_stopping_rounds is None:
+            model.fit(X_train, y_train)
+        elif name == "lgbm":
+            import lightgbm
+            model.fit(
+                X_train[:n_fit], y_train[:n_fit],
+                eval_set=[(X_train[n_fit:], y_train[n_fit:])],
+                callbacks=[lightgbm.early_stopping(early_stopping_rounds, verbose=False)]
+            )
+        elif name == "catboost":
+            model.fit(
+                X_train[:n_fit], y_train[:n_fit],
+                eval_set=(X_train[n_fit:], y_train[n_fit:]),
+                early_stopping_rounds=early_stopping_rounds
+            )
+        else:
+            model.fit(X_train, y_train)
+
+        result = {"pred": model.predict(X_test)}
+        if task == "classification":
+            result["proba"] = model.predict_proba(X_test)[:, 1]
+
+    # --------------------------------------
+    # Number of boosting rounds actually kept
+    # --------------------------------------
+    n_iter = getattr(model, "n_estimators_", None)
+    if name == "lgbm":
+        n_iter = model.best_iteration_ or model.n_estimators
+    elif name == "catboost":
+        n_iter = model.get_best_iteration()
+        if n_iter is None:
+            n_iter = model.tree_count_
+
+    result.update({
+        "task": task,
+        "model": name,
+        "n_threads": n_threads,
+        "n_iterations": n_iter,
+        "wall_time_s": round(time.perf_counter() - start, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    })
+
+    return result
+
+
+# ============================================================
+# 5. Function to fit a model zoo concurrently
+# ============================================================
+
+def run_model_zoo(task, handle, models=None, cpus_per_model=None, n_workers=None,
+                  early_stopping_rounds=None):
+    if models is None:
+        models = REGRESSION_MODELS if task == "regression" else CLASSIFICATION_MODELS
+
+    # --------------------------------------
+    # CPU budget: workers x threads <= cores
+    # --------------------------------------
+    n_cpus = os.cpu_count() or 1
+    if cpus_per_model is None:
+        cpus_per_model = max(1, n_cpus // len(models))
+    if n_workers is None:
+        n_workers = max(1, min(len(models), n_cpus // cpus_per_model))
+
+    # --------------------------------------
+    # One fresh process per model (maxtasksperchild=1)
+    # so the peak RSS belongs to that model only
+    # --------------------------------------
+    with mp.get_context("spawn").Pool(processes=n_workers, maxtasksperchild=1) as pool:
+        jobs = [
+            pool.apply_async(fit_one_model, (task, name, handle, cpus_per_model, early_stopping_rounds))
+            for name in models
+        ]
+        results = [job.get() for job in jobs]
+
+    # --------------------------------------
+    # Per-model statistics
+    # --------------------------------------
+    stats = pd.DataFrame([
+        {k: v for k, v in r.items() if k not in ("pred", "proba")} for r in results
+    ])
+
+    return results, stats
+
+
+# ============================================================
+# 6. Complete nightly retrain: both tasks + CSV outputs
+# ============================================================
+
+def train_all_models(df_final, df_fe, df_high_rating_flags, output_dir=".",
+                     cpus_per_model=None, early_stopping_rounds=None):
+    # --------------------------------------
+    # Same features / targets as the notebook
+    # --------------------------------------
+    features = df_fe.drop(columns=["rawg_id"], errors="ignore")
+
+    tasks = {
+        "regression": {
+            "target": df_final["user_rating"],
+            "test_size": 0.2,
+            "stratify": False,
+        },
+        "classification": {
+            "target": df_high_rating_flags["is_high_rating"],
+            "test_size": 0.25,
+            "stratify": True,
+        },
+    }
+
+    all_stats = []
+    outputs = {}
+
+    for task, cfg in tasks.items():
+        handle = prepare_shared_matrices(
+            features, cfg["target"], test_size=cfg["test_size"], stratify=cfg["stratify"]
+        )
+        try:
+            results, stats = run_model_zoo(
+                task, handle, cpus_per_model=cpus_per_model, early_stopping_rounds=early_stopping_rounds
+            )
+        finally:
+            release_shared_matrices(handle)
+
+        # ----------------------------------
+        # Prediction table (notebook layout)
+        # ----------------------------------
+        df_preds = df_final.loc[handle["test_index"], ["rawg_id", "game_name"]].copy()
+
+        if task == "regression":
+            df_preds["y_true_rating"] = handle["y_test"].values
+            for r in results:
+                df_preds[f"y_pred_{r['model']}"] = r["pred"]
+            outputs["reg"] = df_preds
+        else:
+            df_preds["y_true_is_high_rating"] = handle["y_test"].values
+            for r in results:
+                df_preds[f"{r['model']}_pred_proba"] = r["proba"]
+            for r in results:
+                df_preds[f"{r['model']}_pred"] = r["pred"]
+            outputs["clf"] = df_preds
+
+        all_stats.append(stats)
+
+    # --------------------------------------
+    # CSV export (same files as the notebook)
+    # --------------------------------------
+    df_stats = pd.concat(all_stats, ignore_index=True)
+
+    outputs["reg"].to_csv(os.path.join(output_dir, "df_ml_preds_reg.csv"), sep=";", index=False)
+    outputs["clf"].to_csv(os.path.join(output_dir, "df_ml_preds_clf.csv"), sep=";", index=False)
+    df_stats.to_csv(os.path.join(output_dir, "df_ml_training_stats.csv"), sep=";", index=False)
+
+    return outputs["reg"], outputs["clf"], df_stats